@@ -0,0 +1,153 @@
+# backend/app/api/async_routes.py
+"""
+Async versions of the auth and graph routes, served from an AsyncSession.
+Mounted instead of the sync routes when Settings.DB_ASYNC is true.
+"""
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Response
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.app.db import models
+from backend.app.db.database import get_async_db
+from backend.app.db.schemas import (
+    RegisterIn,
+    LoginIn,
+    TokenOut,
+    MeOut,
+    RefreshIn,
+    ReachableOut,
+)
+from backend.app.core.deps import get_current_user_async
+from backend.app.core.responses import ORJSONResponse
+from backend.app.api.auth import (
+    hash_password_async,
+    verify_password_async,
+    create_token_pair,
+    token_subject,
+    check_user,
+    CurrentUser,
+    TokenType,
+)
+from backend.app.api.graph import reachable_courses
+from backend.app.services import program_graph
+
+router = APIRouter()
+
+
+# ------------------ AUTH ENDPOINTS ------------------ #
+
+
+@router.post("/auth/register", response_model=MeOut, status_code=201)
+async def register(payload: RegisterIn, db: AsyncSession = Depends(get_async_db)):
+    existing = await db.scalar(
+        select(models.User).where(models.User.email == payload.email)
+    )
+    if existing:
+        raise HTTPException(status_code=400, detail="Email already registered")
+
+    user = models.User(
+        email=payload.email,
+        password_hash=await hash_password_async(payload.password),
+        role=payload.role,
+    )
+    db.add(user)
+    await db.commit()
+    await db.refresh(user)
+
+    return MeOut(user_id=user.user_id, email=user.email, role=user.role)
+
+
+@router.post("/auth/login", response_model=TokenOut)
+async def login(payload: LoginIn, db: AsyncSession = Depends(get_async_db)):
+    user = await db.scalar(
+        select(models.User).where(models.User.email == payload.email)
+    )
+    if not user or not await verify_password_async(
+        payload.password, user.password_hash
+    ):
+        raise HTTPException(status_code=401, detail="Invalid credentials")
+
+    access, refresh = create_token_pair(user.user_id, user.token_version)
+    return TokenOut(access_token=access, refresh_token=refresh)
+
+
+@router.post("/auth/refresh", response_model=TokenOut)
+async def refresh(payload: RefreshIn, db: AsyncSession = Depends(get_async_db)):
+    user_id, token_version = token_subject(payload.refresh_token, TokenType.REFRESH)
+    user = check_user(await db.get(models.User, user_id), token_version)
+
+    access, refresh = create_token_pair(user.user_id, user.token_version)
+    return TokenOut(access_token=access, refresh_token=refresh)
+
+
+@router.get("/auth/me", response_model=MeOut)
+async def me(current_user: CurrentUser = Depends(get_current_user_async)):
+    return MeOut(
+        user_id=current_user.user_id, email=current_user.email, role=current_user.role
+    )
+
+
+@router.post("/auth/logout")
+async def logout(
+    current_user: CurrentUser = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db),
+):
+    # Revokes all outstanding tokens; the flush hook drops the cached user
+    user = await db.get(models.User, current_user.user_id)
+    user.token_version = models.User.token_version + 1
+    await db.commit()
+    return {"message": "Logged out"}
+
+
+# ------------------ GRAPH ENDPOINTS ------------------ #
+
+
+@router.get("/graph/{program_id}", response_class=ORJSONResponse)
+async def get_program_graph(
+    program_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    if_none_match: Optional[str] = Header(default=None),
+):
+    """Async twin of api.graph.get_program_graph; same ETag and cache rules."""
+    version = await db.run_sync(program_graph.get_program_version, program_id)
+    if version is None:
+        raise HTTPException(
+            status_code=404, detail="Program not found or has no courses"
+        )
+
+    headers = {
+        "ETag": program_graph.graph_etag(program_id, version),
+        "Cache-Control": "no-cache",
+    }
+    if program_graph.etag_matches(if_none_match, headers["ETag"]):
+        return Response(status_code=304, headers=headers)
+
+    # Graph loading is shared with the sync route; run_sync drives it on the
+    # async connection without blocking the event loop on I/O
+    compiled = await db.run_sync(program_graph.get_compiled_graph, program_id, version)
+    if compiled is None:
+        raise HTTPException(
+            status_code=404, detail="Program not found or has no courses"
+        )
+
+    return ORJSONResponse(compiled.payload, headers=headers)
+
+
+@router.get("/graph/{program_id}/ancestors/{course_code}", response_model=ReachableOut)
+async def get_course_ancestors(
+    program_id: int, course_code: str, db: AsyncSession = Depends(get_async_db)
+):
+    return await db.run_sync(reachable_courses, program_id, course_code, "ancestors")
+
+
+@router.get(
+    "/graph/{program_id}/descendants/{course_code}", response_model=ReachableOut
+)
+async def get_course_descendants(
+    program_id: int, course_code: str, db: AsyncSession = Depends(get_async_db)
+):
+    return await db.run_sync(
+        reachable_courses, program_id, course_code, "descendants"
+    )
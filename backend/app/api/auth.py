@@ -1,75 +1,173 @@
+import hashlib
+import time
+from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
+from enum import Enum
 from typing import Optional
 
-from fastapi import Depends, HTTPException
+from fastapi import HTTPException
 from fastapi.security import OAuth2PasswordBearer
 from jose import jwt, JWTError
-from passlib.context import CryptContext
+from sqlalchemy import event
 from sqlalchemy.orm import Session
 
+from backend.app.core.cache import LRUCache
+from backend.app.core.config import settings
+from backend.app.core.security import password_hasher
 from backend.app.db.models import User
-from backend.app.db.database import get_db
 
-# Security settings
-SECRET_KEY = "supersecret"  # ⚠️ replace with env var in production
+# Security settings (secret and lifetimes come from Settings / .env)
 ALGORITHM = "HS256"
-ACCESS_TOKEN_EXPIRE_MINUTES = 30
-REFRESH_TOKEN_EXPIRE_DAYS = 7
 
-pwd_context = CryptContext(schemes=["bcrypt_sha256"], deprecated="auto")
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
+# Same scheme for routes that work without a token (None when absent)
+optional_oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login", auto_error=False)
 
 
-# Password utilities
+class TokenType(str, Enum):
+    ACCESS = "access"
+    REFRESH = "refresh"
+
+
+@dataclass(frozen=True)
+class CurrentUser:
+    """Immutable snapshot of an authenticated user, safe to share across requests."""
+
+    user_id: int
+    email: str
+    role: str
+    token_version: int
+
+    @classmethod
+    def from_user(cls, user: User) -> "CurrentUser":
+        return cls(
+            user_id=user.user_id,
+            email=user.email,
+            role=user.role,
+            token_version=user.token_version or 0,
+        )
+
+
+# user_id -> CurrentUser, so protected routes skip the users lookup.
+# The snapshot carries token_version, so revoked tokens are caught on a hit.
+user_cache = LRUCache(maxsize=settings.USER_CACHE_SIZE, ttl=settings.USER_CACHE_TTL_S)
+
+
+def invalidate_user(user_id: int) -> None:
+    """Drop a user from this worker's cache (logout, role change, deletion)."""
+    user_cache.pop(user_id)
+
+
+@event.listens_for(Session, "after_flush")
+def _invalidate_changed_users(session, flush_context):
+    for obj in (*session.dirty, *session.deleted):
+        if isinstance(obj, User):
+            invalidate_user(obj.user_id)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _invalidate_on_bulk_user_writes(orm_execute_state):
+    # query(User).delete()/update() bypass flush; we can't tell which rows
+    if (orm_execute_state.is_delete or orm_execute_state.is_update) and any(
+        mapper.class_ is User for mapper in orm_execute_state.all_mappers
+    ):
+        user_cache.clear()
+
+
+# Password utilities (bcrypt runs on password_hasher's process pool)
 def hash_password(plain: str) -> str:
-    return pwd_context.hash(plain)
+    return password_hasher.hash(plain)
 
 
 def verify_password(plain: str, hashed: str) -> bool:
-    return pwd_context.verify(plain, hashed)
+    return password_hasher.verify(plain, hashed)
+
+
+async def hash_password_async(plain: str) -> str:
+    return await password_hasher.hash_async(plain)
+
+
+async def verify_password_async(plain: str, hashed: str) -> bool:
+    return await password_hasher.verify_async(plain, hashed)
 
 
 # JWT utilities
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     to_encode = data.copy()
     expire = datetime.now(timezone.utc) + (
-        expires_delta or timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
+        expires_delta or timedelta(minutes=settings.ACCESS_TOKEN_EXPIRES_MIN)
     )
 
-    to_encode.update({"exp": expire})
-    return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
+    to_encode.update({"exp": expire, "type": TokenType.ACCESS.value})
+    return jwt.encode(to_encode, settings.SECRET_KEY, algorithm=ALGORITHM)
 
 
 def create_refresh_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     to_encode = data.copy()
     expire = datetime.now(timezone.utc) + (
-        expires_delta or timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS)
+        expires_delta or timedelta(days=settings.REFRESH_TOKEN_EXPIRES_DAYS)
     )
 
-    to_encode.update({"exp": expire, "type": "refresh"})
-    return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
+    to_encode.update({"exp": expire, "type": TokenType.REFRESH.value})
+    return jwt.encode(to_encode, settings.SECRET_KEY, algorithm=ALGORITHM)
 
 
-def decode_token(token: str) -> dict:
-    try:
-        return jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-    except JWTError:
-        raise HTTPException(status_code=401, detail="Invalid or expired token")
+def create_token_pair(user_id: int, token_version: int) -> tuple[str, str]:
+    """Access + refresh tokens for a user at their current token_version."""
+    claims = {"sub": str(user_id), "tv": token_version}
+    return create_access_token(claims), create_refresh_token(claims)
+
 
+# sha256(token) -> verified claims, kept until the token's own exp
+token_cache = LRUCache(maxsize=settings.TOKEN_CACHE_SIZE)
 
-# Dependency to get current logged-in user
-def get_current_user(
-    token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)
-) -> User:
+
+def decode_token(token: str) -> dict:
+    key = hashlib.sha256(token.encode()).digest()
+    claims = token_cache.get(key)
+    if claims is None:
+        try:
+            claims = jwt.decode(token, settings.SECRET_KEY, algorithms=[ALGORITHM])
+        except JWTError:
+            raise HTTPException(status_code=401, detail="Invalid or expired token")
+
+        exp = claims.get("exp")
+        if isinstance(exp, (int, float)):
+            # exp is wall-clock; the cache expires on the monotonic clock
+            token_cache.set(key, claims, expires_at=time.monotonic() + exp - time.time())
+    return dict(claims)
+
+
+def token_subject(token: str, token_type: TokenType) -> tuple[int, int]:
+    """Verify a token of the given type and return its (user_id, token_version)."""
+    payload = decode_token(token)
+    if payload.get("type") != token_type.value:
+        raise HTTPException(status_code=401, detail="Wrong token type")
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        user_id: int = payload.get("user_id")
-        if user_id is None:
-            raise HTTPException(status_code=401, detail="Invalid token")
-    except JWTError:
-        raise HTTPException(status_code=401, detail="Invalid or expired token")
-
-    user = db.query(User).filter(User.user_id == user_id).first()
+        return int(payload["sub"]), int(payload.get("tv", 0))
+    except (KeyError, TypeError, ValueError):
+        raise HTTPException(status_code=401, detail="Invalid token")
+
+
+def cached_user(user_id: int, token_version: int) -> Optional[CurrentUser]:
+    """
+    The cached user for a token, or None if it must be loaded. A cached
+    token_version newer than the token's means the token was revoked.
+    """
+    current = user_cache.get(user_id)
+    if current is None or current.token_version < token_version:
+        return None
+    if current.token_version != token_version:
+        raise HTTPException(status_code=401, detail="Token revoked")
+    return current
+
+
+def check_user(user: Optional[User], token_version: int) -> CurrentUser:
+    """Validate a freshly loaded user against a token and cache the snapshot."""
     if not user:
         raise HTTPException(status_code=401, detail="User not found")
-    return user
+    current = CurrentUser.from_user(user)
+    user_cache.set(current.user_id, current)
+    if current.token_version != token_version:
+        raise HTTPException(status_code=401, detail="Token revoked")
+    return current
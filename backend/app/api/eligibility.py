@@ -0,0 +1,87 @@
+# backend/app/api/eligibility.py
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+
+from backend.app.api.auth import CurrentUser
+from backend.app.api.progress import staff_only
+from backend.app.core.deps import get_current_user, get_read_db
+from backend.app.db.schemas import EligibilityOut, EligibleCourseOut
+from backend.app.services import eligibility
+
+router = APIRouter()
+
+
+def _statuses(include_in_progress: bool) -> tuple[str, ...]:
+    if include_in_progress:
+        return eligibility.COMPLETED_OR_IN_PROGRESS
+    return eligibility.COMPLETED
+
+
+def _eligibility(
+    db: Session, program_id: int, user_id: int, include_in_progress: bool
+) -> EligibilityOut:
+    statuses = _statuses(include_in_progress)
+    courses = eligibility.eligible_courses(db, program_id, user_id, statuses)
+    if courses is None:
+        raise HTTPException(
+            status_code=404, detail="Program not found or has no courses"
+        )
+    return EligibilityOut(
+        program_id=program_id,
+        user_id=user_id,
+        eligible=[
+            EligibleCourseOut(course_id=course_id, course_code=code)
+            for course_id, code in courses
+        ],
+    )
+
+
+@router.get("/{program_id}", response_model=EligibilityOut)
+def get_my_eligibility(
+    program_id: int,
+    include_in_progress: bool = False,
+    current_user: CurrentUser = Depends(get_current_user),
+    db: Session = Depends(get_read_db),
+):
+    """
+    Courses of a program the current user can take next. With
+    include_in_progress, in-progress courses count as done (next-term view).
+    """
+    return _eligibility(db, program_id, current_user.user_id, include_in_progress)
+
+
+@router.get("/{program_id}/users/{user_id}", response_model=EligibilityOut)
+def get_user_eligibility(
+    program_id: int,
+    user_id: int,
+    include_in_progress: bool = False,
+    current_user: CurrentUser = Depends(staff_only),
+    db: Session = Depends(get_read_db),
+):
+    return _eligibility(db, program_id, user_id, include_in_progress)
+
+
+@router.get("/{program_id}/cohort")
+def get_cohort_eligibility(
+    program_id: int,
+    include_in_progress: bool = False,
+    current_user: CurrentUser = Depends(staff_only),
+    db: Session = Depends(get_read_db),
+):
+    """
+    Eligibility for every student with progress in the program, streamed as
+    NDJSON: one {"user_id": ..., "eligible": [course_id, ...]} per line.
+    All progress rows are loaded with one query before streaming starts.
+    """
+    statuses = _statuses(include_in_progress)
+    reqs = eligibility.get_requirements(db, program_id)
+    if reqs is None:
+        raise HTTPException(
+            status_code=404, detail="Program not found or has no courses"
+        )
+    user_ids, done = eligibility.load_cohort(db, program_id, reqs, statuses)
+    return StreamingResponse(
+        eligibility.iter_cohort_ndjson(reqs, user_ids, done),
+        media_type="application/x-ndjson",
+    )
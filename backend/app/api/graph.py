@@ -1,53 +1,172 @@
 # backend/app/api/graph.py
-from fastapi import APIRouter, Depends, HTTPException
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Response
 from sqlalchemy.orm import Session
-import networkx as nx
 
-from backend.app.db import models, database
+from backend.app.api.auth import CurrentUser
+from backend.app.core.deps import get_read_db, require_role
+from backend.app.core.responses import ORJSONResponse
+from backend.app.db import database, models
+from backend.app.db.schemas import PrerequisiteIn, ReachableOut, UserRole
+from backend.app.services import program_graph, reachability
 
 router = APIRouter()
+# Mounted in both sync and async modes, ahead of the read routes so their
+# /{program_id} doesn't swallow /cache/stats
+stats_router = APIRouter()
+# Graph writes; mounted in both sync and async modes
+admin_router = APIRouter()
+admin_only = require_role(UserRole.admin)
+
+
+@stats_router.get("/cache/stats", response_class=ORJSONResponse)
+def get_graph_cache_stats():
+    """Hit/miss/eviction counters of this worker's compiled-graph cache."""
+    return program_graph.graph_cache.stats()
 
 
-@router.get("/{program_id}")
-def get_program_graph(program_id: int, db: Session = Depends(database.get_db)):
+@router.get("/{program_id}", response_class=ORJSONResponse)
+def get_program_graph(
+    program_id: int,
+    db: Session = Depends(get_read_db),
+    if_none_match: Optional[str] = Header(default=None),
+):
     """
     Returns a prerequisite graph for a given program in Cytoscape.js JSON format.
     Nodes use course_code as ID, edges link course_code -> course_code.
+    AND/OR prerequisite groups become their own nodes ("group-<group_id>"),
+    with edges member course -> group -> course.
+
+    The graph is compiled once per program version and served from cache.
+    Responses carry an ETag derived from the program's graph_version; a
+    matching If-None-Match is answered with 304 before any graph work.
     """
+    version = program_graph.get_program_version(db, program_id)
+    if version is None:
+        raise HTTPException(
+            status_code=404, detail="Program not found or has no courses"
+        )
 
-    # 1. Get all courses for this program
-    courses = (
-        db.query(models.Course).filter(models.Course.program_id == program_id).all()
-    )
-    if not courses:
+    # no-cache: clients may store the graph but must revalidate each time
+    headers = {
+        "ETag": program_graph.graph_etag(program_id, version),
+        "Cache-Control": "no-cache",
+    }
+    if program_graph.etag_matches(if_none_match, headers["ETag"]):
+        return Response(status_code=304, headers=headers)
+
+    compiled = program_graph.get_compiled_graph(db, program_id, version)
+    if compiled is None:
         raise HTTPException(
             status_code=404, detail="Program not found or has no courses"
         )
 
-    # 2. Build directed graph
-    G = nx.DiGraph()
+    return ORJSONResponse(compiled.payload, headers=headers)
+
+
+def reachable_courses(
+    db: Session, program_id: int, course_code: str, direction: str
+) -> ReachableOut:
+    """
+    Ancestors or descendants of a course from the program's reachability
+    index; shared by the sync and async routes.
+    """
+    found = reachability.get_reachability(db, program_id)
+    if found is None:
+        raise HTTPException(
+            status_code=404, detail="Program not found or has no courses"
+        )
+    reqs, index = found
+    i = reqs.positions.get(course_code)
+    if i is None:
+        raise HTTPException(status_code=404, detail="Course not found in program")
+
+    rows = index.ancestors if direction == "ancestors" else index.descendants
+    return ReachableOut(
+        program_id=program_id,
+        course_code=course_code,
+        courses=[reqs.codes[j] for j in reachability.bit_positions(rows[i])],
+    )
+
+
+@router.get("/{program_id}/ancestors/{course_code}", response_model=ReachableOut)
+def get_course_ancestors(
+    program_id: int, course_code: str, db: Session = Depends(get_read_db)
+):
+    """Every course that is a prerequisite of course_code, at any depth."""
+    return reachable_courses(db, program_id, course_code, "ancestors")
+
+
+@router.get("/{program_id}/descendants/{course_code}", response_model=ReachableOut)
+def get_course_descendants(
+    program_id: int, course_code: str, db: Session = Depends(get_read_db)
+):
+    """Every course that course_code unlocks, at any depth."""
+    return reachable_courses(db, program_id, course_code, "descendants")
+
+
+# ------------------ PREREQUISITE EDITS (ADMIN) ------------------ #
+
+
+def _course_ids(db: Session, program_id: int, *codes: str) -> list[int]:
+    found = dict(
+        db.query(models.Course.course_code, models.Course.course_id).filter(
+            models.Course.program_id == program_id,
+            models.Course.course_code.in_(codes),
+        )
+    )
+    missing = [code for code in codes if code not in found]
+    if missing:
+        raise HTTPException(
+            status_code=404, detail=f"Course not found in program: {missing[0]}"
+        )
+    return [found[code] for code in codes]
+
+
+@admin_router.post("/{program_id}/prerequisites", status_code=201)
+def add_prerequisite(
+    program_id: int,
+    payload: PrerequisiteIn,
+    current_user: CurrentUser = Depends(admin_only),
+    db: Session = Depends(database.get_db),
+):
+    """
+    Add a legacy (AND) prerequisite edge. Cached graphs pick it up from the
+    change log; edges that would close a cycle are rejected with 409.
+    """
+    course_id, prereq_id = _course_ids(
+        db, program_id, payload.course_code, payload.prereq_code
+    )
+    db.add(models.Prerequisite(course_id=course_id, prereq_course_id=prereq_id))
+    try:
+        db.commit()
+    except reachability.PrerequisiteCycleError as exc:
+        db.rollback()
+        raise HTTPException(status_code=409, detail=str(exc))
+    return {"course_code": payload.course_code, "prereq_code": payload.prereq_code}
 
-    # Nodes: use course_code as id, course_name as label
-    for course in courses:
-        G.add_node(course.course_code, label=course.course_name)
 
-    # Edges: prereq.course_code -> course.course_code
-    prereqs = (
+@admin_router.delete(
+    "/{program_id}/prerequisites/{course_code}/{prereq_code}", status_code=204
+)
+def remove_prerequisite(
+    program_id: int,
+    course_code: str,
+    prereq_code: str,
+    current_user: CurrentUser = Depends(admin_only),
+    db: Session = Depends(database.get_db),
+):
+    course_id, prereq_id = _course_ids(db, program_id, course_code, prereq_code)
+    # ORM deletes (not a bulk delete) so the change log sees every row
+    edges = (
         db.query(models.Prerequisite)
-        .join(models.Course, models.Prerequisite.course_id == models.Course.course_id)
-        .filter(models.Course.program_id == program_id)
+        .filter_by(course_id=course_id, prereq_course_id=prereq_id)
         .all()
     )
-    for prereq in prereqs:
-        source = db.query(models.Course).get(prereq.prereq_course_id).course_code
-        target = db.query(models.Course).get(prereq.course_id).course_code
-        if source and target:
-            G.add_edge(source, target)
-
-    # 3. Convert to Cytoscape.js format
-    nodes = [
-        {"data": {"id": node, "label": G.nodes[node]["label"]}} for node in G.nodes
-    ]
-    edges = [{"data": {"source": u, "target": v}} for u, v in G.edges]
-
-    return {"nodes": nodes, "edges": edges}
+    if not edges:
+        raise HTTPException(status_code=404, detail="Prerequisite not found")
+    for edge in edges:
+        db.delete(edge)
+    db.commit()
+    return Response(status_code=204)
@@ -0,0 +1,68 @@
+# backend/app/api/planner.py
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+
+from backend.app.api.auth import CurrentUser
+from backend.app.api.progress import staff_only
+from backend.app.core.deps import get_current_user, get_read_db
+from backend.app.db.schemas import PlannedCourseOut, PlanOut, PlanTermOut
+from backend.app.services import planner
+
+router = APIRouter()
+
+
+def _plan(db: Session, program_id: int, user_id: int, max_credits: int) -> PlanOut:
+    result = planner.plan_for_user(db, program_id, user_id, max_credits)
+    if result is None:
+        raise HTTPException(
+            status_code=404, detail="Program not found or has no courses"
+        )
+    reqs, plan = result
+
+    def course(i: int) -> PlannedCourseOut:
+        return PlannedCourseOut(
+            course_id=reqs.course_ids[i],
+            course_code=reqs.codes[i],
+            credits=reqs.credits[i],
+        )
+
+    return PlanOut(
+        program_id=program_id,
+        user_id=user_id,
+        max_credits=max_credits,
+        terms=[
+            PlanTermOut(
+                term=n,
+                credits=sum(reqs.credits[i] for i in term),
+                courses=[course(i) for i in term],
+            )
+            for n, term in enumerate(plan.terms, start=1)
+        ],
+        lower_bound_terms=plan.lower_bound,
+        unschedulable=[course(i) for i in plan.unschedulable],
+    )
+
+
+@router.get("/{program_id}", response_model=PlanOut)
+def get_my_plan(
+    program_id: int,
+    max_credits: int = Query(default=planner.DEFAULT_MAX_CREDITS, ge=1, le=40),
+    current_user: CurrentUser = Depends(get_current_user),
+    db: Session = Depends(get_read_db),
+):
+    """
+    Term-by-term plan from the current user's progress to completing every
+    course in the program. In-progress courses count as done.
+    """
+    return _plan(db, program_id, current_user.user_id, max_credits)
+
+
+@router.get("/{program_id}/users/{user_id}", response_model=PlanOut)
+def get_user_plan(
+    program_id: int,
+    user_id: int,
+    max_credits: int = Query(default=planner.DEFAULT_MAX_CREDITS, ge=1, le=40),
+    current_user: CurrentUser = Depends(staff_only),
+    db: Session = Depends(get_read_db),
+):
+    return _plan(db, program_id, user_id, max_credits)
@@ -0,0 +1,132 @@
+# backend/app/api/progress.py
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import func, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from backend.app.api.auth import CurrentUser
+from backend.app.core.deps import get_current_user, get_read_db, require_role
+from backend.app.db import database, models
+from backend.app.db.schemas import (
+    ProgressBatchIn,
+    ProgressPageOut,
+    ProgressStatus,
+    ProgressSyncOut,
+    StudentProgressOut,
+    UserRole,
+)
+
+router = APIRouter()
+
+# Advisors and admins may read and sync any student's transcript
+staff_only = require_role(UserRole.admin, UserRole.advisor)
+
+# Students may plan their own courses, but completions come from staff:
+# eligibility and planning trust them
+SELF_SERVICE_STATUSES = {ProgressStatus.planned, ProgressStatus.in_progress}
+
+
+def upsert_progress(db: Session, user_id: int, batch: ProgressBatchIn) -> int:
+    """
+    Apply a batch of (course_id, status) pairs for a user in a single
+    INSERT ... ON CONFLICT (user_id, course_id) DO UPDATE statement.
+    Returns the number of distinct courses written.
+    """
+    # ON CONFLICT cannot touch the same row twice in one statement; last wins
+    statuses = {item.course_id: item.status.value for item in batch.items}
+    if not statuses:
+        return 0
+
+    table = models.StudentProgress.__table__
+    stmt = database.dialect_insert(db.get_bind(), table).values(
+        [
+            {"user_id": user_id, "course_id": course_id, "status": status}
+            for course_id, status in statuses.items()
+        ]
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[table.c.user_id, table.c.course_id],
+        set_={"status": stmt.excluded.status, "updated_at": func.now()},
+    )
+    try:
+        db.execute(stmt)
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(status_code=404, detail="Unknown user or course")
+    return len(statuses)
+
+
+def read_progress(
+    db: Session, user_id: int, after: Optional[int], limit: int
+) -> ProgressPageOut:
+    """One page of a user's progress, keyset-paginated by course_id."""
+    stmt = (
+        select(models.StudentProgress)
+        .where(models.StudentProgress.user_id == user_id)
+        .order_by(models.StudentProgress.course_id)
+        .limit(limit + 1)
+    )
+    if after is not None:
+        stmt = stmt.where(models.StudentProgress.course_id > after)
+    rows = db.scalars(stmt).all()
+
+    # The extra row only tells us whether another page exists
+    items = [StudentProgressOut.model_validate(r) for r in rows[:limit]]
+    next_after = items[-1].course_id if len(rows) > limit else None
+    return ProgressPageOut(items=items, next_after=next_after)
+
+
+# ------------------ OWN PROGRESS ------------------ #
+
+
+@router.get("/me", response_model=ProgressPageOut)
+def get_my_progress(
+    after: Optional[int] = None,
+    limit: int = Query(default=100, ge=1, le=1000),
+    current_user: CurrentUser = Depends(get_current_user),
+    db: Session = Depends(get_read_db),
+):
+    return read_progress(db, current_user.user_id, after, limit)
+
+
+@router.put("/me", response_model=ProgressSyncOut)
+def sync_my_progress(
+    payload: ProgressBatchIn,
+    current_user: CurrentUser = Depends(get_current_user),
+    db: Session = Depends(database.get_db),
+):
+    if any(item.status not in SELF_SERVICE_STATUSES for item in payload.items):
+        raise HTTPException(
+            status_code=403, detail="Completed courses are recorded by staff"
+        )
+    upserted = upsert_progress(db, current_user.user_id, payload)
+    return ProgressSyncOut(user_id=current_user.user_id, upserted=upserted)
+
+
+# ------------------ STUDENT PROGRESS (STAFF) ------------------ #
+
+
+@router.get("/users/{user_id}", response_model=ProgressPageOut)
+def get_user_progress(
+    user_id: int,
+    after: Optional[int] = None,
+    limit: int = Query(default=100, ge=1, le=1000),
+    current_user: CurrentUser = Depends(staff_only),
+    db: Session = Depends(get_read_db),
+):
+    return read_progress(db, user_id, after, limit)
+
+
+@router.put("/users/{user_id}", response_model=ProgressSyncOut)
+def sync_user_progress(
+    user_id: int,
+    payload: ProgressBatchIn,
+    current_user: CurrentUser = Depends(staff_only),
+    db: Session = Depends(database.get_db),
+):
+    """Sync a whole transcript for a student in one round trip."""
+    upserted = upsert_progress(db, user_id, payload)
+    return ProgressSyncOut(user_id=user_id, upserted=upserted)
@@ -0,0 +1,86 @@
+import time
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, Hashable, Optional
+
+
+class LRUCache:
+    """
+    Thread-safe, size-bounded LRU cache with hit/miss/eviction counters.
+    Sync routes run in Starlette's threadpool, so every access takes the lock.
+    With ttl (seconds), entries also expire; set() can pass an explicit
+    monotonic expires_at instead.
+    """
+
+    def __init__(self, maxsize: int, ttl: Optional[float] = None):
+        if maxsize < 1:
+            raise ValueError("maxsize must be >= 1")
+        self.maxsize = maxsize
+        self.ttl = ttl
+        # key -> (value, expires_at or None)
+        self._data: OrderedDict[Hashable, tuple[Any, Optional[float]]] = OrderedDict()
+        self._lock = Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            try:
+                value, expires_at = self._data[key]
+            except KeyError:
+                self.misses += 1
+                return default
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._data[key]
+                self.expirations += 1
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def peek(self, key: Hashable, default: Any = None) -> Any:
+        """Like get, but leaves the counters and the LRU order untouched."""
+        with self._lock:
+            entry = self._data.get(key)
+        if entry is None or (entry[1] is not None and entry[1] <= time.monotonic()):
+            return default
+        return entry[0]
+
+    def set(self, key: Hashable, value: Any, expires_at: Optional[float] = None) -> None:
+        if expires_at is None and self.ttl is not None:
+            expires_at = time.monotonic() + self.ttl
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._data.pop(key, None)
+        return default if entry is None else entry[0]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._data
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
@@ -1,50 +1,90 @@
-from fastapi import Depends, HTTPException, status
-from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from typing import Generator, Optional
+
+from fastapi import Cookie, Depends, HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from backend.app.db.database import get_db
-from backend.app.db.models import User, UserRole
-from backend.app.api.auth import decode_token, TokenType
 
-bearer_scheme = HTTPBearer(auto_error=True)
+from backend.app.core.read_your_writes import COOKIE_NAME, in_window
+from backend.app.db.database import get_async_db, get_db, read_session
+from backend.app.db.models import User
+from backend.app.db.schemas import UserRole
+from backend.app.api.auth import (
+    CurrentUser,
+    TokenType,
+    cached_user,
+    check_user,
+    oauth2_scheme,
+    optional_oauth2_scheme,
+    token_subject,
+)
 
 
 def get_current_user(
-    creds: HTTPAuthorizationCredentials = Depends(bearer_scheme),
-    db: Session = Depends(get_db),
-) -> User:
-    token = creds.credentials
+    token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)
+) -> CurrentUser:
+    """
+    One decode (served from the token cache when hot) and at most one
+    users lookup (skipped on a user-cache hit) per request. Tokens are
+    revoked by bumping User.token_version.
+    """
+    user_id, token_version = token_subject(token, TokenType.ACCESS)
+    # Commits on this session open the user's read-your-writes window
+    db.info["user_id"] = user_id
+    current = cached_user(user_id, token_version)
+    if current is None:
+        current = check_user(db.get(User, user_id), token_version)
+    return current
+
+
+async def get_current_user_async(
+    token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_async_db)
+) -> CurrentUser:
+    user_id, token_version = token_subject(token, TokenType.ACCESS)
+    db.info["user_id"] = user_id
+    current = cached_user(user_id, token_version)
+    if current is None:
+        current = check_user(await db.get(User, user_id), token_version)
+    return current
+
+
+def get_read_db(
+    token: Optional[str] = Depends(optional_oauth2_scheme),
+    last_write: Optional[str] = Cookie(default=None, alias=COOKIE_NAME),
+) -> Generator:
+    """
+    Read-only session for GET routes: a replica, or the primary while the
+    caller's signed last-write cookie (core.read_your_writes) is valid. The
+    token only routes the read; routes still authenticate via
+    get_current_user, so an invalid token is ignored here.
+    """
+    primary = False
+    if token and last_write:
+        try:
+            user_id, _ = token_subject(token, TokenType.ACCESS)
+            primary = in_window(last_write, user_id)
+        except HTTPException:
+            pass
+    db = read_session(primary)
     try:
-        payload = decode_token(token)
-    except Exception:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token"
-        )
-
-    if payload.get("type") != TokenType.ACCESS:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED, detail="Wrong token type"
-        )
-
-    user_id = int(payload.get("sub", 0))
-    token_version = int(payload.get("tv", -1))
-
-    user = db.query(User).filter(User.id == user_id).first()
-    if not user or not user.is_active:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found"
-        )
-
-    if user.token_version != token_version:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED, detail="Token revoked"
-        )
-
-    return user
-
-def require_role(required: UserRole):
-    def role_checker(user: User = Depends(get_current_user)):
-        if user.role != required:
-            raise HTTPException(status_code=403, detail="Forbidden: insufficient role")
+        yield db
+    finally:
+        db.close()
+
+
+def require_role(*roles: UserRole, dependency=get_current_user):
+    """
+    Dependency that allows only users with one of the given roles. Roles come
+    from the cached user snapshot, so the check costs no extra query.
+    Pass dependency=get_current_user_async for async routes.
+    """
+    allowed = {UserRole(role).value for role in roles}
+
+    def role_checker(user: CurrentUser = Depends(dependency)) -> CurrentUser:
+        if user.role not in allowed:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Forbidden: insufficient role",
+            )
         return user
+
     return role_checker
-    
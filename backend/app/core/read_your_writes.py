@@ -0,0 +1,78 @@
+# backend/app/core/read_your_writes.py
+"""
+Read-your-writes window for replica reads, carried by the client.
+
+A request whose session commits a write for the current user gets a signed
+cookie "<user_id>.<expiry>.<signature>" valid for READ_YOUR_WRITES_S.
+core.deps.get_read_db sends that user's reads to the primary while the
+cookie is valid. The window travels with the client rather than living in
+one worker's memory, so it holds whichever worker serves the next read.
+"""
+import hashlib
+import hmac
+import math
+import time
+from typing import Optional
+
+from backend.app.core.config import settings
+from backend.app.db.database import request_writers
+
+COOKIE_NAME = "last_write"
+
+
+def _signature(payload: str) -> str:
+    key = settings.SECRET_KEY.encode()
+    return hmac.new(key, payload.encode(), hashlib.sha256).hexdigest()[:32]
+
+
+def sign_window(user_id: int) -> str:
+    """Cookie value opening user_id's window from now."""
+    expires = math.ceil(time.time() + settings.READ_YOUR_WRITES_S)
+    payload = f"{user_id}.{expires}"
+    return f"{payload}.{_signature(payload)}"
+
+
+def in_window(value: Optional[str], user_id: int) -> bool:
+    """True if value is an unexpired window signed for user_id."""
+    if not value:
+        return False
+    payload, _, signature = value.rpartition(".")
+    owner, _, expires = payload.partition(".")
+    if not hmac.compare_digest(signature, _signature(payload)):
+        return False
+    try:
+        return int(owner) == user_id and int(expires) > time.time()
+    except ValueError:
+        return False
+
+
+class ReadYourWritesMiddleware:
+    """Collects the users a request wrote for and sets their window cookie."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        writers = set()
+        token = request_writers.set(writers)
+
+        async def send_with_cookie(message):
+            # Routes commit before their response starts
+            if message["type"] == "http.response.start" and writers:
+                cookie = (
+                    f"{COOKIE_NAME}={sign_window(max(writers))}; "
+                    f"Max-Age={math.ceil(settings.READ_YOUR_WRITES_S)}; "
+                    "Path=/; HttpOnly; SameSite=lax"
+                )
+                headers = list(message.get("headers", []))
+                headers.append((b"set-cookie", cookie.encode("latin-1")))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_cookie)
+        finally:
+            request_writers.reset(token)
@@ -0,0 +1,20 @@
+from typing import Any
+
+import orjson
+from fastapi.responses import JSONResponse
+
+
+class ORJSONResponse(JSONResponse):
+    """
+    JSONResponse rendered with orjson. bytes content is taken as already
+    serialized JSON (e.g. a cached graph payload) and sent as is.
+    Routes with a response_model don't need it: FastAPI serializes those
+    through Pydantic directly.
+    """
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, bytes):
+            return content
+        return orjson.dumps(
+            content, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        )
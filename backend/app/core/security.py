@@ -0,0 +1,150 @@
+# backend/app/core/security.py
+"""
+Password hashing on a dedicated, bounded process pool.
+
+bcrypt is deliberately slow. Run inline, a burst of registrations or
+logins holds Starlette's shared threadpool and starves unrelated routes.
+Hashes run in their own worker processes instead. At most
+PASSWORD_HASH_MAX_PENDING calls are queued or running; past that, callers
+get a 503 right away instead of waiting in a queue.
+"""
+import asyncio
+import multiprocessing
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from threading import BoundedSemaphore, Lock
+
+from fastapi import HTTPException
+from passlib.context import CryptContext
+from starlette.concurrency import run_in_threadpool
+
+from backend.app.core.config import settings
+
+pwd_context = CryptContext(
+    schemes=["bcrypt_sha256"],
+    deprecated="auto",
+    bcrypt_sha256__rounds=settings.BCRYPT_ROUNDS,
+)
+
+
+# Module-level so worker processes can unpickle them
+def _hash(plain: str) -> str:
+    return pwd_context.hash(plain)
+
+
+def _verify(plain: str, hashed: str) -> bool:
+    return pwd_context.verify(plain, hashed)
+
+
+def _busy() -> HTTPException:
+    return HTTPException(
+        status_code=503,
+        detail="Password service busy, retry shortly",
+        headers={"Retry-After": "1"},
+    )
+
+
+class PasswordHasher:
+    """
+    Runs bcrypt in a separately sized process pool with a bounded queue.
+    With workers=0 hashing runs inline in the caller (async callers: on the
+    threadpool), same as before.
+    """
+
+    def __init__(self, workers: int, max_pending: int, timeout: float):
+        self.workers = workers
+        self.max_pending = max_pending
+        self.timeout = timeout
+        self._executor = None
+        self._slots = BoundedSemaphore(max_pending)
+        self._lock = Lock()
+        self.in_flight = 0
+        self.completed = 0
+        self.rejected = 0
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                # spawn: uvicorn workers are multi-threaded, fork is not safe there
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            return self._executor
+
+    def _done(self, _: Future) -> None:
+        with self._lock:
+            self.in_flight -= 1
+            self.completed += 1
+        self._slots.release()
+
+    def _submit(self, fn, *args) -> Future:
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self.rejected += 1
+            raise _busy()
+        with self._lock:
+            self.in_flight += 1
+        try:
+            future = self._get_executor().submit(fn, *args)
+        except Exception:
+            self._done(None)
+            raise
+        future.add_done_callback(self._done)
+        return future
+
+    def _run(self, fn, *args):
+        if not self.workers:
+            return fn(*args)
+        try:
+            return self._submit(fn, *args).result(timeout=self.timeout)
+        except FutureTimeoutError:
+            raise _busy()
+
+    async def _run_async(self, fn, *args):
+        if not self.workers:
+            # Inline mode must still keep bcrypt off the event loop
+            return await run_in_threadpool(fn, *args)
+        try:
+            return await asyncio.wait_for(
+                asyncio.wrap_future(self._submit(fn, *args)), self.timeout
+            )
+        except asyncio.TimeoutError:
+            raise _busy()
+
+    def hash(self, plain: str) -> str:
+        return self._run(_hash, plain)
+
+    def verify(self, plain: str, hashed: str) -> bool:
+        return self._run(_verify, plain, hashed)
+
+    async def hash_async(self, plain: str) -> str:
+        return await self._run_async(_hash, plain)
+
+    async def verify_async(self, plain: str, hashed: str) -> bool:
+        return await self._run_async(_verify, plain, hashed)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "max_pending": self.max_pending,
+                "in_flight": self.in_flight,
+                # Calls submitted but not yet picked up by a worker
+                "queue_depth": max(0, self.in_flight - self.workers),
+                "completed": self.completed,
+                "rejected": self.rejected,
+            }
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+password_hasher = PasswordHasher(
+    workers=settings.PASSWORD_HASH_WORKERS,
+    max_pending=settings.PASSWORD_HASH_MAX_PENDING,
+    timeout=settings.PASSWORD_HASH_TIMEOUT_S,
+)
@@ -1,22 +1,321 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, DeclarativeBase
+import itertools
+import threading
+import time
+from contextvars import ContextVar
+from typing import AsyncGenerator, Generator, Optional
+
+from sqlalchemy import create_engine, event, exc
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
 from backend.app.core.config import settings
 
+# Declarative Base lives in models.py; the engine is built on first use, so
+# importing the app never touches the database.
+_engine = None
 
-class Base(DeclarativeBase):
-    pass
 
+# ------------------ POOL ------------------ #
 
-engine = create_engine(settings.DATABASE_URL, pool_pre_ping=True)
-SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False)
 
-# Dependency
-from typing import Generator
+class PoolMetrics:
+    """Checkout counters of one engine's pool, kept across dispose()."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        # Checkouts that found the pool exhausted and had to queue
+        self.waits = 0
+        self.timeouts = 0
+        self.checkout_s = 0.0
+        self.max_checkout_s = 0.0
+
+    def record(self, elapsed: float, waited: bool, timed_out: bool = False) -> None:
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+            else:
+                self.checkouts += 1
+            self.waits += waited
+            self.checkout_s += elapsed
+            self.max_checkout_s = max(self.max_checkout_s, elapsed)
+
+    def stats(self, pool=None) -> dict:
+        with self._lock:
+            out = {
+                "checkouts": self.checkouts,
+                "waits": self.waits,
+                "timeouts": self.timeouts,
+                # Includes opening new connections, not only queueing
+                "checkout_ms_total": round(self.checkout_s * 1000, 3),
+                "checkout_ms_max": round(self.max_checkout_s * 1000, 3),
+            }
+        if isinstance(pool, QueuePool):
+            out.update(
+                size=pool.size(),
+                checked_out=pool.checkedout(),
+                overflow=pool.overflow(),
+            )
+        return out
+
+
+def _metered(pool_class, metrics: PoolMetrics):
+    """pool_class that times every checkout into `metrics`."""
+
+    class MeteredPool(pool_class):
+        def _do_get(self):
+            waited = (
+                self._max_overflow > -1
+                and self.checkedin() == 0
+                and self.overflow() >= self._max_overflow
+            )
+            start = time.perf_counter()
+            try:
+                conn = super()._do_get()
+            except exc.TimeoutError:
+                metrics.record(time.perf_counter() - start, waited, timed_out=True)
+                raise
+            metrics.record(time.perf_counter() - start, waited)
+            return conn
+
+    MeteredPool.__name__ = f"Metered{pool_class.__name__}"
+    return MeteredPool
+
+
+pool_metrics = PoolMetrics()
+async_pool_metrics = PoolMetrics()
+MeteredQueuePool = _metered(QueuePool, pool_metrics)
+MeteredAsyncQueuePool = _metered(AsyncAdaptedQueuePool, async_pool_metrics)
+
+
+def engine_options(url: str, is_async: bool = False) -> dict:
+    """create_engine keyword arguments for `url` from the DB_* settings."""
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+    options = {"pool_pre_ping": settings.DB_POOL_PRE_PING}
+    if backend == "sqlite" and parsed.database in (None, "", ":memory:"):
+        # In-memory SQLite keeps its single-connection pool
+        return options
+
+    options.update(
+        poolclass=MeteredAsyncQueuePool if is_async else MeteredQueuePool,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT_S,
+        pool_recycle=settings.DB_POOL_RECYCLE_S,
+    )
+    if backend == "postgresql" and settings.DB_STATEMENT_TIMEOUT_MS > 0:
+        timeout = str(settings.DB_STATEMENT_TIMEOUT_MS)
+        if parsed.get_driver_name() == "asyncpg":
+            options["connect_args"] = {"server_settings": {"statement_timeout": timeout}}
+        else:
+            options["connect_args"] = {"options": f"-c statement_timeout={timeout}"}
+    return options
+
+
+def get_engine():
+    """This process's sync engine, created (but not connected) on first use."""
+    global _engine
+    if _engine is None:
+        _engine = create_engine(
+            settings.DATABASE_URL, **engine_options(settings.DATABASE_URL)
+        )
+        SessionLocal.configure(bind=_engine)
+        ReadSessionLocal.configure(bind=_read_only(_engine))
+    return _engine
+
 
+def _read_only(engine):
+    """PostgreSQL runs read-only sessions as BEGIN READ ONLY transactions."""
+    if engine.dialect.name == "postgresql":
+        return engine.execution_options(postgresql_readonly=True)
+    return engine
 
+
+def dispose_engine() -> None:
+    """Close pooled connections (worker shutdown); the engines stay usable."""
+    if _engine is not None:
+        _engine.dispose()
+    for replica in _replicas or ():
+        replica.engine.dispose()
+
+
+class _LazySessionmaker(sessionmaker):
+    """sessionmaker that builds the engine when the first session is made."""
+
+    def __call__(self, **local_kw):
+        get_engine()
+        return super().__call__(**local_kw)
+
+
+class ReadOnlySession(Session):
+    """Session for GET routes: refuses to write anything back."""
+
+    def flush(self, objects=None):
+        if self.new or self.dirty or self.deleted:
+            raise exc.InvalidRequestError("Read-only session cannot flush changes")
+        super().flush(objects)
+
+
+SessionLocal = _LazySessionmaker(autoflush=False, autocommit=False)
+ReadSessionLocal = _LazySessionmaker(
+    class_=ReadOnlySession, autoflush=False, expire_on_commit=False
+)
+
+
+def __getattr__(name):
+    # `from database import engine` keeps working without an import-time engine
+    if name == "engine":
+        return get_engine()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+# Dependency
 def get_db() -> Generator:
     db = SessionLocal()
     try:
         yield db
     finally:
         db.close()
+
+
+# ------------------ READ REPLICAS ------------------ #
+
+
+class _Replica:
+    __slots__ = ("engine", "bind", "metrics")
+
+    def __init__(self, url: str):
+        self.metrics = PoolMetrics()
+        options = engine_options(url)
+        if "poolclass" in options:
+            options["poolclass"] = _metered(QueuePool, self.metrics)
+        self.engine = create_engine(url, **options)
+        self.bind = _read_only(self.engine)
+
+
+_replicas: Optional[list[_Replica]] = None
+_next_replica = itertools.count()
+
+# Users who committed a write during the current request. core.read_your_writes
+# sets this per request and hands the window to the client as a signed
+# cookie, so it holds whichever worker serves the next read.
+request_writers: ContextVar[Optional[set]] = ContextVar(
+    "request_writers", default=None
+)
+
+
+def get_replicas() -> list[_Replica]:
+    """Engines for DATABASE_REPLICA_URLS, created on first use."""
+    global _replicas
+    if _replicas is None:
+        urls = [u.strip() for u in settings.DATABASE_REPLICA_URLS.split(",")]
+        _replicas = [_Replica(url) for url in urls if url]
+    return _replicas
+
+
+def read_session(primary: bool = False) -> Session:
+    """
+    Read-only session on the next replica (round robin). Falls back to the
+    primary when no replica is configured or when asked to (the caller is
+    inside their read-your-writes window).
+    """
+    replicas = get_replicas()
+    if not replicas or primary:
+        return ReadSessionLocal()
+    replica = replicas[next(_next_replica) % len(replicas)]
+    return ReadSessionLocal(bind=replica.bind)
+
+
+# Sessions record who they act for (core.deps.get_current_user) and whether
+# they wrote; a commit then opens that user's read-your-writes window.
+@event.listens_for(Session, "do_orm_execute")
+def _note_statement_write(orm_execute_state):
+    state = orm_execute_state
+    if state.is_insert or state.is_update or state.is_delete:
+        state.session.info["wrote"] = True
+
+
+@event.listens_for(Session, "after_flush")
+def _note_flush_write(session, flush_context):
+    session.info["wrote"] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _open_read_your_writes_window(session):
+    if session.info.pop("wrote", False):
+        user_id = session.info.get("user_id")
+        writers = request_writers.get()
+        if user_id is not None and writers is not None:
+            writers.add(user_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_write_note(session):
+    session.info.pop("wrote", None)
+
+
+def pool_stats() -> dict:
+    """Checkout metrics and live occupancy of the sync, replica and async pools."""
+    return {
+        "sync": pool_metrics.stats(_engine.pool if _engine is not None else None),
+        "replicas": [r.metrics.stats(r.engine.pool) for r in _replicas or ()],
+        "async": async_pool_metrics.stats(
+            _async_engine.pool if _async_engine is not None else None
+        ),
+    }
+
+
+# ------------------ ASYNC ENGINE ------------------ #
+
+# Async drivers per backend; the engine is only built when an async route runs
+ASYNC_DRIVERS = {"postgresql": "asyncpg", "sqlite": "aiosqlite"}
+
+_async_engine = None
+_AsyncSessionLocal = None
+
+
+def async_database_url(url: str) -> str:
+    """Swap a sync driver (psycopg2, pysqlite) for its async counterpart."""
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise NotImplementedError(f"No async driver configured for {backend}")
+    return parsed.set(
+        drivername=f"{backend}+{ASYNC_DRIVERS[backend]}"
+    ).render_as_string(hide_password=False)
+
+
+def get_async_engine():
+    global _async_engine, _AsyncSessionLocal
+    if _async_engine is None:
+        url = settings.ASYNC_DATABASE_URL or async_database_url(settings.DATABASE_URL)
+        _async_engine = create_async_engine(url, **engine_options(url, is_async=True))
+        _AsyncSessionLocal = async_sessionmaker(
+            bind=_async_engine, autoflush=False, expire_on_commit=False
+        )
+    return _async_engine
+
+
+async def dispose_async_engine() -> None:
+    global _async_engine, _AsyncSessionLocal
+    if _async_engine is not None:
+        await _async_engine.dispose()
+    _async_engine = _AsyncSessionLocal = None
+
+
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    get_async_engine()
+    async with _AsyncSessionLocal() as db:
+        yield db
+
+
+def dialect_insert(bind, table):
+    """INSERT construct with ON CONFLICT support for the bind's dialect."""
+    if bind.dialect.name == "postgresql":
+        return postgresql.insert(table)
+    if bind.dialect.name == "sqlite":
+        return sqlite.insert(table)
+    raise NotImplementedError(f"Upserts are not supported on {bind.dialect.name}")
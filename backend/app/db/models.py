@@ -1,13 +1,20 @@
 from sqlalchemy import (
     Column,
+    delete,
+    event,
+    insert,
+    or_,
+    select,
+    update,
     Integer,
     String,
     Text,
     DateTime,
     ForeignKey,
+    Index,
     UniqueConstraint,
 )
-from sqlalchemy.orm import relationship, declarative_base
+from sqlalchemy.orm import Session, relationship, declarative_base
 from sqlalchemy.sql import func
 
 Base = declarative_base()
@@ -21,6 +28,8 @@ class User(Base):
     email = Column(String(150), unique=True, nullable=False)
     password_hash = Column(String(255), nullable=False)
     role = Column(String(50), nullable=False)
+    # Embedded in JWTs as "tv"; bumping it revokes every outstanding token
+    token_version = Column(Integer, nullable=False, default=0, server_default="0")
     created_at = Column(DateTime, server_default=func.now())
 
     progress = relationship("StudentProgress", back_populates="user")
@@ -32,6 +41,8 @@ class Program(Base):
 
     program_id = Column(Integer, primary_key=True, index=True)
     name = Column(String(255), unique=True, nullable=False)
+    # Bumped on every course/prerequisite write; keys the compiled-graph cache
+    graph_version = Column(Integer, nullable=False, default=0, server_default="0")
     created_at = Column(DateTime, server_default=func.now())
 
     courses = relationship("Course", back_populates="program")
@@ -141,3 +152,193 @@ class StudentProgress(Base):
     course = relationship("Course", back_populates="progress")
 
     __table_args__ = (UniqueConstraint("user_id", "course_id", name="uq_user_course"),)
+
+
+# === Import checkpoints ===
+class ImportCheckpoint(Base):
+    __tablename__ = "import_checkpoints"
+
+    import_key = Column(String(512), primary_key=True)
+    phase = Column(String(20), nullable=False)
+    rows_done = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
+
+
+# === Graph change log ===
+class GraphChange(Base):
+    """
+    One prerequisite edge added to or removed from a program's graph, at the
+    graph_version it produced. Cached graphs replay these deltas instead of
+    rebuilding; op "rebuild" marks versions that changed more than edges.
+    """
+
+    __tablename__ = "graph_changes"
+
+    change_id = Column(Integer, primary_key=True)
+    program_id = Column(
+        Integer, ForeignKey("programs.program_id", ondelete="CASCADE"), nullable=False
+    )
+    version = Column(Integer, nullable=False)
+    op = Column(String(10), nullable=False)  # "add", "remove" or "rebuild"
+    # Legacy edge: prereq_course_id -> course_id; group edge: member -> group_id
+    course_id = Column(Integer)
+    group_id = Column(Integer)
+    prereq_course_id = Column(Integer)
+    created_at = Column(DateTime, server_default=func.now())
+
+    __table_args__ = (Index("ix_graph_changes_program_version", "program_id", "version"),)
+
+
+# Versions older than this are never replayed; their log rows are pruned
+GRAPH_CHANGE_RETENTION = 64
+
+
+# === Graph versioning ===
+def bump_graph_versions(connection, program_ids=(), course_ids=(), group_ids=()):
+    """
+    Increment Program.graph_version for every program touched by the given
+    programs, courses or prerequisite groups. Used by ORM flushes and by the
+    CSV importer so cached graphs are never served stale.
+    """
+    conditions = []
+    if program_ids:
+        conditions.append(Program.program_id.in_(set(program_ids)))
+    if course_ids:
+        conditions.append(
+            Program.program_id.in_(
+                select(Course.program_id).where(Course.course_id.in_(set(course_ids)))
+            )
+        )
+    if group_ids:
+        conditions.append(
+            Program.program_id.in_(
+                select(Course.program_id)
+                .join(PrerequisiteGroup, PrerequisiteGroup.course_id == Course.course_id)
+                .where(PrerequisiteGroup.group_id.in_(set(group_ids)))
+            )
+        )
+    if not conditions:
+        return
+    connection.execute(
+        update(Program)
+        .where(or_(*conditions))
+        .values(graph_version=Program.graph_version + 1)
+    )
+
+
+def _log_graph_changes(connection, programs, rebuild, edges):
+    """Write the change-log rows for one flush (after its version bump)."""
+    versions = dict(
+        connection.execute(
+            select(Program.program_id, Program.graph_version).where(
+                Program.program_id.in_(programs)
+            )
+        ).all()
+    )
+    rows = [
+        {"program_id": program_id, "version": versions[program_id], "op": "rebuild"}
+        for program_id in rebuild
+        if program_id in versions
+    ]
+    rows += [
+        {
+            "program_id": program_id,
+            "version": versions[program_id],
+            "op": op,
+            "course_id": course_id,
+            "group_id": group_id,
+            "prereq_course_id": prereq_course_id,
+        }
+        for program_id, op, course_id, group_id, prereq_course_id in edges
+        if program_id not in rebuild and program_id in versions
+    ]
+    if rows:
+        connection.execute(insert(GraphChange), rows)
+    connection.execute(
+        delete(GraphChange).where(
+            GraphChange.program_id.in_(programs),
+            GraphChange.version
+            <= select(Program.graph_version)
+            .where(Program.program_id == GraphChange.program_id)
+            .scalar_subquery()
+            - GRAPH_CHANGE_RETENTION,
+        )
+    )
+
+
+@event.listens_for(Session, "after_flush")
+def _bump_graph_versions_on_flush(session, flush_context):
+    changed = [
+        obj
+        for obj in (*session.new, *session.dirty, *session.deleted)
+        if isinstance(
+            obj, (Course, Prerequisite, PrerequisiteGroup, PrerequisiteGroupMember)
+        )
+        and (obj not in session.dirty or session.is_modified(obj))
+    ]
+    if not changed:
+        return
+
+    connection = session.connection()
+    course_ids = {
+        obj.course_id
+        for obj in changed
+        if isinstance(obj, (Prerequisite, PrerequisiteGroup))
+    } - {None}
+    group_ids = {
+        obj.group_id for obj in changed if isinstance(obj, PrerequisiteGroupMember)
+    } - {None}
+    course_program, group_program = {}, {}
+    if course_ids:
+        course_program = dict(
+            connection.execute(
+                select(Course.course_id, Course.program_id).where(
+                    Course.course_id.in_(course_ids)
+                )
+            ).all()
+        )
+    if group_ids:
+        group_program = dict(
+            connection.execute(
+                select(PrerequisiteGroup.group_id, Course.program_id)
+                .join(Course, PrerequisiteGroup.course_id == Course.course_id)
+                .where(PrerequisiteGroup.group_id.in_(group_ids))
+            ).all()
+        )
+
+    # Added/removed edges can be replayed on a cached graph; anything else
+    # (courses, groups, edits in place) makes the program rebuild
+    rebuild, edges = set(), []
+    for obj in changed:
+        if isinstance(obj, Course):
+            program_id = obj.program_id
+        elif isinstance(obj, (Prerequisite, PrerequisiteGroup)):
+            program_id = course_program.get(obj.course_id)
+        else:
+            program_id = group_program.get(obj.group_id)
+        if program_id is None:
+            continue
+        if isinstance(obj, (Prerequisite, PrerequisiteGroupMember)) and (
+            obj not in session.dirty
+        ):
+            op = "add" if obj in session.new else "remove"
+            if isinstance(obj, Prerequisite):
+                edges.append((program_id, op, obj.course_id, None, obj.prereq_course_id))
+            else:
+                edges.append((program_id, op, None, obj.group_id, obj.prereq_course_id))
+        else:
+            rebuild.add(program_id)
+
+    programs = rebuild | {edge[0] for edge in edges}
+    if not programs:
+        return
+    bump_graph_versions(connection, program_ids=programs)
+    _log_graph_changes(connection, programs, rebuild, edges)
+    # Versions bumped by this (uncommitted) transaction must not be cached
+    session.info.setdefault("graph_programs", set()).update(programs)
+
+
+@event.listens_for(Session, "after_commit")
+@event.listens_for(Session, "after_rollback")
+def _forget_graph_programs(session):
+    session.info.pop("graph_programs", None)
@@ -1,5 +1,5 @@
 # backend/app/schemas.py
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, Field
 from enum import Enum
 
 
@@ -14,6 +14,12 @@ class UserRole(str, Enum):
     student = "student"
 
 
+class ProgressStatus(str, Enum):
+    completed = "completed"
+    in_progress = "in_progress"
+    planned = "planned"
+
+
 # ============================================================
 # Auth Schemas
 # ============================================================
@@ -90,6 +96,18 @@ class GraphOut(BaseModel):
     edges: list[GraphEdge]
 
 
+class PrerequisiteIn(BaseModel):
+    course_code: str
+    prereq_code: str
+
+
+class ReachableOut(BaseModel):
+    program_id: int
+    course_code: str
+    # Transitive prerequisites (ancestors) or dependents (descendants)
+    courses: list[str]
+
+
 # ============================================================
 # Student Progress Schemas
 # ============================================================
@@ -102,3 +120,68 @@ class StudentProgressOut(BaseModel):
     status: str
 
     model_config = ConfigDict(from_attributes=True)
+
+
+class ProgressItemIn(BaseModel):
+    course_id: int
+    status: ProgressStatus
+
+
+class ProgressBatchIn(BaseModel):
+    # One multi-row upsert per batch; keeps bind parameters under driver limits
+    items: list[ProgressItemIn] = Field(max_length=1000)
+
+
+class ProgressSyncOut(BaseModel):
+    user_id: int
+    upserted: int
+
+
+class ProgressPageOut(BaseModel):
+    items: list[StudentProgressOut]
+    # Pass as ?after= to fetch the next page; None on the last page
+    next_after: int | None = None
+
+
+# ============================================================
+# Eligibility Schemas
+# ============================================================
+
+
+class EligibleCourseOut(BaseModel):
+    course_id: int
+    course_code: str
+
+
+class EligibilityOut(BaseModel):
+    program_id: int
+    user_id: int
+    eligible: list[EligibleCourseOut]
+
+
+# ============================================================
+# Degree Plan Schemas
+# ============================================================
+
+
+class PlannedCourseOut(BaseModel):
+    course_id: int
+    course_code: str
+    credits: int
+
+
+class PlanTermOut(BaseModel):
+    term: int
+    credits: int
+    courses: list[PlannedCourseOut]
+
+
+class PlanOut(BaseModel):
+    program_id: int
+    user_id: int
+    max_credits: int
+    terms: list[PlanTermOut]
+    # No schedule can be shorter than this many terms
+    lower_bound_terms: int
+    # Courses whose prerequisites can never be satisfied
+    unschedulable: list[PlannedCourseOut]
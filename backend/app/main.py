@@ -1,77 +1,172 @@
-from fastapi import FastAPI, Depends, HTTPException
+from contextlib import asynccontextmanager
+from typing import Optional
+
+from fastapi import APIRouter, FastAPI, Depends, HTTPException
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 
+from backend.app.core.config import settings
+from backend.app.core.security import password_hasher
 from backend.app.db import models
-from backend.app.db.database import engine, get_db
+from backend.app.db.database import (
+    dispose_async_engine,
+    dispose_engine,
+    get_db,
+    get_engine,
+    pool_stats,
+)
 from backend.app.db.schemas import RegisterIn, LoginIn, TokenOut, MeOut, RefreshIn
+from backend.app.core.deps import get_current_user
+from backend.app.core.read_your_writes import ReadYourWritesMiddleware
+from backend.app.core.responses import ORJSONResponse
 from backend.app.api.auth import (
-    hash_password,
-    verify_password,
-    create_access_token,
-    create_refresh_token,
-    decode_token,
-    get_current_user,
+    hash_password_async,
+    verify_password_async,
+    create_token_pair,
+    token_subject,
+    check_user,
+    user_cache,
+    token_cache,
+    CurrentUser,
+    TokenType,
 )
+from backend.app.api import async_routes, eligibility, graph, planner, progress
+from backend.app.services import program_graph
 
-# Ensure tables exist (mostly for dev, Alembic is preferred in prod)
-models.Base.metadata.create_all(bind=engine)
-
-app = FastAPI()
+auth_router = APIRouter()
+ops_router = APIRouter()
 
 
 # ------------------ AUTH ENDPOINTS ------------------ #
 
 
-@app.post("/auth/register", response_model=MeOut, status_code=201)
-def register(payload: RegisterIn, db: Session = Depends(get_db)):
-    existing = db.query(models.User).filter(models.User.email == payload.email).first()
+def _user_by_email(db: Session, email: str) -> Optional[models.User]:
+    return db.query(models.User).filter(models.User.email == email).first()
+
+
+def _save_user(db: Session, user: models.User) -> models.User:
+    db.add(user)
+    db.commit()
+    db.refresh(user)
+    return user
+
+
+# register/login are async so a burst only waits on the hasher's process
+# pool; their short DB calls still go through the threadpool
+@auth_router.post("/auth/register", response_model=MeOut, status_code=201)
+async def register(payload: RegisterIn, db: Session = Depends(get_db)):
+    existing = await run_in_threadpool(_user_by_email, db, payload.email)
     if existing:
         raise HTTPException(status_code=400, detail="Email already registered")
 
     user = models.User(
         email=payload.email,
-        password_hash=hash_password(payload.password),
+        password_hash=await hash_password_async(payload.password),
         role=payload.role,
     )
-    db.add(user)
-    db.commit()
-    db.refresh(user)
+    user = await run_in_threadpool(_save_user, db, user)
 
     # ✅ use user.user_id
     return MeOut(user_id=user.user_id, email=user.email, role=user.role)
 
 
-@app.post("/auth/login", response_model=TokenOut)
-def login(payload: LoginIn, db: Session = Depends(get_db)):
-    user = db.query(models.User).filter(models.User.email == payload.email).first()
-    if not user or not verify_password(payload.password, user.password_hash):
+@auth_router.post("/auth/login", response_model=TokenOut)
+async def login(payload: LoginIn, db: Session = Depends(get_db)):
+    user = await run_in_threadpool(_user_by_email, db, payload.email)
+    if not user or not await verify_password_async(
+        payload.password, user.password_hash
+    ):
         raise HTTPException(status_code=401, detail="Invalid credentials")
 
-    access = create_access_token({"user_id": user.user_id})
-    refresh = create_refresh_token({"user_id": user.user_id})
+    access, refresh = create_token_pair(user.user_id, user.token_version)
     return TokenOut(access_token=access, refresh_token=refresh)
 
 
-@app.post("/auth/refresh", response_model=TokenOut)
-def refresh(payload: RefreshIn):
-    data = decode_token(payload.refresh_token)
-    if data.get("type") != "refresh":
-        raise HTTPException(status_code=401, detail="Invalid refresh token")
+@auth_router.post("/auth/refresh", response_model=TokenOut)
+def refresh(payload: RefreshIn, db: Session = Depends(get_db)):
+    # Always re-check the user row: refresh is rare and must see revocations
+    user_id, token_version = token_subject(payload.refresh_token, TokenType.REFRESH)
+    user = check_user(db.get(models.User, user_id), token_version)
 
-    user_id = data.get("user_id")
-    access = create_access_token({"user_id": user_id})
-    refresh = create_refresh_token({"user_id": user_id})
+    access, refresh = create_token_pair(user.user_id, user.token_version)
     return TokenOut(access_token=access, refresh_token=refresh)
 
 
-@app.get("/auth/me", response_model=MeOut)
-def me(current_user: models.User = Depends(get_current_user)):
+@auth_router.get("/auth/me", response_model=MeOut)
+def me(current_user: CurrentUser = Depends(get_current_user)):
     return MeOut(
         user_id=current_user.user_id, email=current_user.email, role=current_user.role
     )
 
 
-@app.post("/auth/logout")
-def logout(_: models.User = Depends(get_current_user)):
-    # Stateless JWT logout = client just discards token
+@auth_router.post("/auth/logout")
+def logout(
+    current_user: CurrentUser = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    # Bumping token_version revokes every token issued so far; the flush
+    # hook in api.auth drops the cached user
+    user = db.get(models.User, current_user.user_id)
+    user.token_version = models.User.token_version + 1
+    db.commit()
     return {"message": "Logged out"}
+
+
+# ------------------ METRICS ------------------ #
+
+
+@ops_router.get("/metrics", response_class=ORJSONResponse)
+def metrics():
+    """Per-worker counters for dashboards."""
+    return {
+        "password_hashing": password_hasher.stats(),
+        "graph_cache": program_graph.graph_cache.stats(),
+        "user_cache": user_cache.stats(),
+        "token_cache": token_cache.stats(),
+        "db_pool": pool_stats(),
+    }
+
+
+# ------------------ APP FACTORY ------------------ #
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Opt-in, for local dev only: Alembic owns the schema everywhere else
+    if settings.DB_CREATE_ALL:
+        models.Base.metadata.create_all(bind=get_engine())
+    yield
+    password_hasher.shutdown()
+    dispose_engine()
+    await dispose_async_engine()
+
+
+def create_app() -> FastAPI:
+    """
+    Build the application with every router mounted. Nothing here connects
+    to the database or imports networkx; the engine is created by the first
+    request that needs it and graphs are built on first use.
+    """
+    app = FastAPI(lifespan=lifespan)
+    app.add_middleware(ReadYourWritesMiddleware)
+    app.include_router(ops_router)
+    app.include_router(graph.stats_router, prefix="/graph")
+
+    # Async mode swaps the sync auth/graph routes for their AsyncSession twins
+    if settings.DB_ASYNC:
+        app.include_router(async_routes.router)
+    else:
+        app.include_router(auth_router)
+        app.include_router(graph.router, prefix="/graph")
+
+    # Progress, eligibility, planning and graph edits have no async twins
+    # yet; they run on the sync pool in both modes
+    app.include_router(progress.router, prefix="/progress")
+    app.include_router(eligibility.router, prefix="/eligibility")
+    app.include_router(planner.router, prefix="/plans")
+    app.include_router(graph.admin_router, prefix="/graph")
+    return app
+
+
+# uvicorn backend.app.main:app (or --factory backend.app.main:create_app)
+app = create_app()
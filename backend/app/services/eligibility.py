@@ -0,0 +1,282 @@
+# backend/app/services/eligibility.py
+"""
+Eligibility engine: which courses can a student take next?
+
+A program's prerequisite graph is compiled once per graph_version into
+integer bitsets over the program's courses (bit i = i-th course). A course
+is eligible when it is not yet done, every course in its `required` mask
+is done, and each of its `any_of` masks has at least one course done.
+Legacy Prerequisite edges and AND groups fold into `required`; every OR
+group becomes one `any_of` mask. Evaluating a student is then a handful of
+integer ANDs per course.
+
+Whole cohorts are evaluated in one go: progress rows become a
+student x course completion matrix and the same requirements, as 0/1
+matrices, are applied with matrix products (see eligible_matrix).
+"""
+from typing import TYPE_CHECKING, Iterable, Iterator, Optional
+
+import orjson
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from backend.app.db import models
+from backend.app.services import program_graph
+
+# numpy is imported on first use to keep worker startup fast
+if TYPE_CHECKING:
+    import numpy as np
+
+COMPLETED = ("completed",)
+COMPLETED_OR_IN_PROGRESS = ("completed", "in_progress")
+
+
+class Requirements:
+    """Bitset form of a program's prerequisites, indexed by course position."""
+
+    __slots__ = (
+        "course_ids",
+        "codes",
+        "credits",
+        "index",
+        "positions",
+        "required",
+        "any_of",
+        "_matrices",
+    )
+
+    def __init__(self, course_ids, codes, required, any_of, credits=None):
+        self.course_ids = tuple(course_ids)
+        self.codes = tuple(codes)
+        self.credits = tuple(credits) if credits is not None else (0,) * len(codes)
+        self.index = {course_id: i for i, course_id in enumerate(self.course_ids)}
+        self.positions = {code: i for i, code in enumerate(self.codes)}
+        self.required = tuple(required)
+        self.any_of = tuple(tuple(masks) for masks in any_of)
+        self._matrices = None
+
+    def __len__(self):
+        return len(self.course_ids)
+
+    def mask(self, course_ids: Iterable[int]) -> int:
+        """Bitset of the given course ids; ids outside the program are ignored."""
+        bits = 0
+        for course_id in course_ids:
+            i = self.index.get(course_id)
+            if i is not None:
+                bits |= 1 << i
+        return bits
+
+    def eligible(self, done: int) -> list[int]:
+        """Positions of the courses that are not done and whose prerequisites are."""
+        out = []
+        for i, (required, any_of) in enumerate(zip(self.required, self.any_of)):
+            if done >> i & 1 or required & done != required:
+                continue
+            if all(m & done for m in any_of):
+                out.append(i)
+        return out
+
+    def updated(
+        self, graph: program_graph.ProgramGraph, positions: Iterable[int]
+    ) -> "Requirements":
+        """
+        A copy with the rows at `positions` recompiled from graph, for
+        edge-only changes (the set of courses, and so every position, is
+        unchanged).
+        """
+        required, any_of = list(self.required), list(self.any_of)
+        for i in positions:
+            required[i], any_of[i] = _compile_course(graph, i)
+        return Requirements(self.course_ids, self.codes, required, any_of, self.credits)
+
+    def matrices(self):
+        """
+        0/1 float32 matrices for cohort evaluation (built once, then cached):
+        required[j, i] = course i requires j, members[j, g] = course j is in
+        OR group g, owner[g, i] = OR group g belongs to course i.
+        """
+        if self._matrices is None:
+            import numpy as np
+
+            n = len(self)
+            ors = [(i, m) for i, masks in enumerate(self.any_of) for m in masks]
+            required = np.zeros((n, n), dtype=np.float32)
+            members = np.zeros((n, len(ors)), dtype=np.float32)
+            owner = np.zeros((len(ors), n), dtype=np.float32)
+            for i, mask in enumerate(self.required):
+                required[bit_positions(mask), i] = 1
+            for g, (i, mask) in enumerate(ors):
+                members[bit_positions(mask), g] = 1
+                owner[g, i] = 1
+            self._matrices = (required, required.sum(axis=0), members, owner)
+        return self._matrices
+
+
+def bit_positions(mask: int) -> list[int]:
+    """Set bit positions of an integer bitset."""
+    out = []
+    while mask:
+        low = mask & -mask
+        out.append(low.bit_length() - 1)
+        mask ^= low
+    return out
+
+
+def _compile_course(
+    graph: program_graph.ProgramGraph, i: int
+) -> tuple[int, list[int]]:
+    """(required mask, OR-group masks) of course node i of a program graph."""
+    n = graph.n_courses
+    req, alternatives = 0, []
+    for pred in graph.predecessors(i):
+        if pred < n:
+            req |= 1 << pred
+            continue
+        if not graph.is_group(pred):
+            # Course outside the program
+            continue
+        # Group node: its predecessors are the member courses
+        members = 0
+        for member in graph.predecessors(pred):
+            if member < n:
+                members |= 1 << member
+        if not members:
+            # Nothing resolvable (e.g. only courses outside the program)
+            continue
+        if graph.labels[pred] == "OR":
+            alternatives.append(members)
+        else:
+            req |= members
+    return req & ~(1 << i), alternatives
+
+
+def compile_requirements(graph: program_graph.ProgramGraph) -> Requirements:
+    """
+    Compile a program graph (see program_graph.build_graph) to bitsets;
+    bit i is course node i.
+    """
+    n = graph.n_courses
+    required, any_of = [], []
+    for i in range(n):
+        req, alternatives = _compile_course(graph, i)
+        required.append(req)
+        any_of.append(alternatives)
+    return Requirements(
+        graph.course_ids, graph.ids[:n], required, any_of, graph.credits
+    )
+
+
+def get_compiled(
+    db: Session, program_id: int, version: Optional[int] = None
+) -> Optional[program_graph.CompiledGraph]:
+    """The program's compiled graph, with its requirements compiled."""
+    compiled = program_graph.get_compiled_graph(db, program_id, version)
+    if compiled is None:
+        return None
+    if compiled.requirements is None:
+        compiled.requirements = compile_requirements(compiled.graph)
+    return compiled
+
+
+def get_requirements(
+    db: Session, program_id: int, version: Optional[int] = None
+) -> Optional[Requirements]:
+    """Compiled requirements for a program, cached alongside its compiled graph."""
+    compiled = get_compiled(db, program_id, version)
+    return compiled.requirements if compiled is not None else None
+
+
+def done_course_ids(db: Session, user_id: int, statuses=COMPLETED) -> list[int]:
+    """Course ids a student has finished (statuses count as done)."""
+    return db.scalars(
+        select(models.StudentProgress.course_id).where(
+            models.StudentProgress.user_id == user_id,
+            models.StudentProgress.status.in_(statuses),
+        )
+    ).all()
+
+
+def eligible_courses(
+    db: Session, program_id: int, user_id: int, statuses=COMPLETED
+) -> Optional[list[tuple[int, str]]]:
+    """
+    (course_id, course_code) of every course the student can take next,
+    or None if the program does not exist or has no courses.
+    """
+    reqs = get_requirements(db, program_id)
+    if reqs is None:
+        return None
+    done = reqs.mask(done_course_ids(db, user_id, statuses))
+    return [(reqs.course_ids[i], reqs.codes[i]) for i in reqs.eligible(done)]
+
+
+# === Cohorts ===
+def load_cohort(
+    db: Session, program_id: int, reqs: Requirements, statuses=COMPLETED
+) -> tuple["np.ndarray", "np.ndarray"]:
+    """
+    Every progress row of the program in one query, as (user_ids, done):
+    done[s, i] is True if student user_ids[s] has finished course i.
+    The cohort is every user with any progress row in the program.
+    """
+    import numpy as np
+
+    rows = db.execute(
+        select(
+            models.StudentProgress.user_id,
+            models.StudentProgress.course_id,
+            models.StudentProgress.status.in_(statuses),
+        )
+        .join(models.Course, models.Course.course_id == models.StudentProgress.course_id)
+        .where(models.Course.program_id == program_id)
+    ).all()
+    if not rows:
+        return np.zeros(0, dtype=np.int64), np.zeros((0, len(reqs)), dtype=bool)
+
+    triples = np.array(rows, dtype=np.int64)
+    user_ids, student = np.unique(triples[:, 0], return_inverse=True)
+    finished = triples[:, 2].astype(bool)
+    # course_id -> position: course_ids are ascending (build_graph orders by id)
+    course_ids = np.array(reqs.course_ids, dtype=np.int64)
+    done = np.zeros((len(user_ids), len(course_ids)), dtype=bool)
+    done[student[finished], np.searchsorted(course_ids, triples[finished, 1])] = True
+    return user_ids, done
+
+
+def eligible_matrix(reqs: Requirements, done: "np.ndarray") -> "np.ndarray":
+    """
+    Vectorized Requirements.eligible for a whole (students x courses) bool
+    matrix: counts of required courses done must reach the required count,
+    and every OR group owned by a course must have a member done.
+    """
+    import numpy as np
+
+    required, required_count, members, owner = reqs.matrices()
+    done_f = done.astype(np.float32)
+    ok = (done_f @ required) >= required_count
+    if owner.shape[0]:
+        unmet = ((done_f @ members) == 0).astype(np.float32)
+        ok &= (unmet @ owner) == 0
+    return ok & ~done
+
+
+def iter_cohort_ndjson(
+    reqs: Requirements, user_ids: "np.ndarray", done: "np.ndarray", block: int = 4096
+) -> Iterator[bytes]:
+    """
+    NDJSON lines {"user_id": ..., "eligible": [course_id, ...]}, evaluated
+    and encoded `block` students at a time to bound memory.
+    """
+    import numpy as np
+
+    course_ids = np.array(reqs.course_ids, dtype=np.int64)
+    for start in range(0, len(user_ids), block):
+        eligible = eligible_matrix(reqs, done[start : start + block])
+        lines = [
+            orjson.dumps(
+                {"user_id": int(user_id), "eligible": course_ids[row].tolist()}
+            )
+            for user_id, row in zip(user_ids[start : start + block], eligible)
+        ]
+        yield b"\n".join(lines) + b"\n"
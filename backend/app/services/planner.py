@@ -0,0 +1,147 @@
+# backend/app/services/planner.py
+"""
+Degree planner: a term-by-term schedule from a student's progress to the
+completion of every course in the program.
+
+Works on the compiled requirements of the program graph (see
+services.eligibility): a course can be taken in a term once its required
+courses, and one member of each of its OR groups, were done in earlier terms.
+Each term holds at most `max_credits` credits.
+
+Minimizing the number of terms under precedence and a capacity is NP-hard,
+so plans come from list scheduling: each term takes the eligible courses in
+priority order until the cap is reached. A few priority rules are tried and
+the shortest plan wins; the search stops as soon as a plan meets the lower
+bound (longest remaining prerequisite chain, or remaining credits / cap).
+"""
+from dataclasses import dataclass, field
+from typing import Optional
+
+from sqlalchemy.orm import Session
+
+from backend.app.services import eligibility
+from backend.app.services.eligibility import Requirements, bit_positions
+from backend.app.services.reachability import prerequisite_masks, topological_order
+
+DEFAULT_MAX_CREDITS = 15
+
+
+@dataclass
+class Plan:
+    """Course positions (see Requirements) per term, first term first."""
+
+    terms: list[list[int]] = field(default_factory=list)
+    lower_bound: int = 0
+    # Remaining courses whose prerequisites can never be met (cycles)
+    unschedulable: list[int] = field(default_factory=list)
+
+
+def _lower_bound(reqs: Requirements, order, done: int, max_credits: int) -> int:
+    """No plan can use fewer terms than this."""
+    earliest = [0] * len(reqs)
+    for i in order:
+        if done >> i & 1:
+            continue
+        term = max((earliest[j] for j in bit_positions(reqs.required[i])), default=0)
+        for group in reqs.any_of[i]:
+            term = max(term, min(earliest[j] for j in bit_positions(group)))
+        earliest[i] = term + 1
+
+    # Courses above the cap fill a term on their own
+    oversized, rest = 0, 0
+    for i in order:
+        if not done >> i & 1:
+            if reqs.credits[i] > max_credits:
+                oversized += 1
+            else:
+                rest += reqs.credits[i]
+    by_credits = oversized + -(-rest // max_credits)
+    return max(max(earliest, default=0), by_credits)
+
+
+def _schedule(reqs: Requirements, priority: list[int], done: int, max_credits: int):
+    """List scheduling of the courses in `priority` order; returns the terms."""
+    remaining = [i for i in priority if not done >> i & 1]
+    terms = []
+    while remaining:
+        term, credits, taken = [], 0, 0
+        for i in remaining:
+            required = reqs.required[i]
+            if required & done != required or not all(
+                m & done for m in reqs.any_of[i]
+            ):
+                continue
+            c = reqs.credits[i]
+            if credits + c > max_credits and term:
+                continue
+            term.append(i)
+            credits += c
+            taken |= 1 << i
+            if credits >= max_credits:
+                break
+        if not term:
+            break
+        terms.append(term)
+        done |= taken
+        remaining = [i for i in remaining if not taken >> i & 1]
+    return terms
+
+
+def plan_terms(
+    reqs: Requirements, done: int, max_credits: int = DEFAULT_MAX_CREDITS
+) -> Plan:
+    """Shortest schedule found for the courses not in the `done` bitset."""
+    order, succ = topological_order(prerequisite_masks(reqs))
+
+    # Longest chain of dependents and number of dependents per course
+    height = [0] * len(reqs)
+    descendants = [0] * len(reqs)
+    for i in reversed(order):
+        for s in bit_positions(succ[i]):
+            height[i] = max(height[i], height[s] + 1)
+            descendants[i] |= descendants[s] | 1 << s
+    fanout = [d.bit_count() for d in descendants]
+    credits = reqs.credits
+
+    plan = Plan(lower_bound=_lower_bound(reqs, order, done, max_credits))
+    rules = [
+        lambda i: (height[i], fanout[i], credits[i]),
+        lambda i: (fanout[i], height[i], credits[i]),
+        lambda i: (height[i], -credits[i], fanout[i]),
+    ]
+    best = None
+    for rule in rules:
+        terms = _schedule(reqs, sorted(order, key=rule, reverse=True), done, max_credits)
+        if best is None or len(terms) < len(best):
+            best = terms
+        if len(best) <= plan.lower_bound:
+            break
+    plan.terms = best
+
+    scheduled = done
+    for term in best:
+        for i in term:
+            scheduled |= 1 << i
+    plan.unschedulable = [i for i in range(len(reqs)) if not scheduled >> i & 1]
+    return plan
+
+
+def plan_for_user(
+    db: Session,
+    program_id: int,
+    user_id: int,
+    max_credits: int = DEFAULT_MAX_CREDITS,
+) -> Optional[tuple[Requirements, Plan]]:
+    """
+    Plan the rest of a program for a student, counting in-progress courses
+    as done. None if the program does not exist or has no courses.
+    """
+    reqs = eligibility.get_requirements(db, program_id)
+    if reqs is None:
+        return None
+    done = reqs.mask(
+        eligibility.done_course_ids(
+            db, user_id, eligibility.COMPLETED_OR_IN_PROGRESS
+        )
+    )
+    return reqs, plan_terms(reqs, done, max_credits)
@@ -0,0 +1,237 @@
+# backend/app/services/prereq_parser.py
+"""
+Prerequisite expression parser.
+
+Catalog strings such as "(BIO252 OR BIO253) AND TCHEM212",
+"CS 101, CS 102, or CS 103" or "MATH120 & (PHYS101 / PHYS111)" are tokenized,
+parsed into an AND/OR AST and normalized into the group rows stored in
+prerequisite_groups: every group must be satisfied, an OR group by any of
+its courses, an AND group by its single course.
+
+OR binds tighter than AND, matching how the catalog data has always been
+read: "BIO252 OR BIO253 AND TCHEM212" means (BIO252 OR BIO253) AND TCHEM212.
+"""
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Union
+
+# CNF expansion of ORs over ANDs is exponential; real catalogs stay far below this
+MAX_GROUPS = 64
+
+# Strings that mean "no prerequisites"
+EMPTY_VALUES = {"", "NONE", "N/A", "NA", "-"}
+
+TOKEN_RE = re.compile(
+    r"\s*(?:"
+    r"(?P<course>[A-Z]{1,8}[\s-]?\d{1,4}[A-Z]?\b)"
+    r"|(?P<and>AND\b|&)"
+    r"|(?P<or>OR\b|/)"
+    r"|(?P<lparen>\()"
+    r"|(?P<rparen>\))"
+    r"|(?P<comma>[,;])"
+    r")"
+)
+
+
+class PrerequisiteSyntaxError(ValueError):
+    """Raised when a prerequisite string cannot be parsed."""
+
+
+# === AST ===
+@dataclass(frozen=True)
+class Course:
+    code: str
+
+
+@dataclass(frozen=True)
+class And:
+    children: tuple
+
+
+@dataclass(frozen=True)
+class Or:
+    children: tuple
+
+
+Node = Union[Course, And, Or]
+
+
+# === Tokenizer ===
+def normalize_code(code: str) -> str:
+    """Course code as prerequisite strings resolve it: "cs 101" -> "CS101"."""
+    return re.sub(r"[\s-]", "", code).upper()
+
+
+def tokenize(text: str) -> list[tuple[str, str]]:
+    """Split an upper-cased prerequisite string into (kind, value) tokens."""
+    tokens = []
+    pos, end = 0, len(text.rstrip())
+    while pos < end:
+        match = TOKEN_RE.match(text, pos)
+        if match is None or match.end() == pos:
+            raise PrerequisiteSyntaxError(
+                f"Unexpected {text[pos:].strip()[:20]!r} in prerequisite {text!r}"
+            )
+        kind = match.lastgroup
+        value = match.group(kind)
+        if kind == "course":
+            value = normalize_code(value)
+        tokens.append((kind, value))
+        pos = match.end()
+    return tokens
+
+
+# === Parser ===
+class _Parser:
+    """
+    Recursive descent over the grammar
+
+        list    := and_exp ("," ["AND" | "OR"] and_exp)*
+        and_exp := or_exp ("AND" or_exp)*
+        or_exp  := atom ("OR" atom)*
+        atom    := COURSE | "(" list ")"
+
+    A comma list takes its operator from the conjunction after a comma
+    ("A, B, or C"), or from a trailing "B or C" when every other item is a
+    single course ("A, B or C"), and defaults to AND ("A, B").
+    """
+
+    def __init__(self, text: str):
+        self.text = text
+        self.tokens = tokenize(text)
+        self.pos = 0
+
+    def parse(self) -> Node:
+        node = self._list()
+        if self.pos != len(self.tokens):
+            self._error()
+        return node
+
+    def _peek(self):
+        return self.tokens[self.pos][0] if self.pos < len(self.tokens) else None
+
+    def _take(self, kind):
+        if self._peek() != kind:
+            self._error()
+        self.pos += 1
+        return self.tokens[self.pos - 1][1]
+
+    def _error(self):
+        found = self.tokens[self.pos][1] if self.pos < len(self.tokens) else "end"
+        raise PrerequisiteSyntaxError(
+            f"Unexpected {found!r} in prerequisite {self.text!r}"
+        )
+
+    def _list(self) -> Node:
+        items = [self._and()]
+        conjunction = None
+        while self._peek() == "comma":
+            self.pos += 1
+            if self._peek() in ("and", "or"):
+                conjunction = self._peek()
+                self.pos += 1
+            items.append(self._and())
+        if len(items) == 1:
+            return items[0]
+
+        if conjunction is None:
+            last = items[-1]
+            if isinstance(last, (And, Or)) and all(
+                isinstance(i, Course) for i in items[:-1]
+            ):
+                return type(last)((*items[:-1], *last.children))
+            conjunction = "and"
+        return (Or if conjunction == "or" else And)(tuple(items))
+
+    def _and(self) -> Node:
+        children = [self._or()]
+        while self._peek() == "and":
+            self.pos += 1
+            children.append(self._or())
+        return children[0] if len(children) == 1 else And(tuple(children))
+
+    def _or(self) -> Node:
+        children = [self._atom()]
+        while self._peek() == "or":
+            self.pos += 1
+            children.append(self._atom())
+        return children[0] if len(children) == 1 else Or(tuple(children))
+
+    def _atom(self) -> Node:
+        if self._peek() == "course":
+            return Course(self._take("course"))
+        self._take("lparen")
+        node = self._list()
+        self._take("rparen")
+        return node
+
+
+def simplify(node: Node) -> Node:
+    """Flatten nested AND/AND and OR/OR, drop duplicate children."""
+    if isinstance(node, Course):
+        return node
+    children = []
+    for child in map(simplify, node.children):
+        for c in child.children if type(child) is type(node) else (child,):
+            if c not in children:
+                children.append(c)
+    return children[0] if len(children) == 1 else type(node)(tuple(children))
+
+
+def to_groups(node: Node) -> list[tuple[str, ...]]:
+    """
+    Normalize an AST to conjunctive normal form: a list of OR-clauses that
+    must all hold. Clauses implied by a smaller clause are dropped.
+    """
+    if isinstance(node, Course):
+        clauses = [(node.code,)]
+    elif isinstance(node, And):
+        clauses = [c for child in node.children for c in to_groups(child)]
+    else:
+        clauses = [()]
+        for child in node.children:
+            clauses = [
+                tuple(dict.fromkeys(a + b)) for a in clauses for b in to_groups(child)
+            ]
+            if len(clauses) > MAX_GROUPS:
+                raise PrerequisiteSyntaxError("Prerequisite expression is too complex")
+
+    unique = list(dict.fromkeys(clauses))
+    return [
+        c
+        for c in unique
+        if not any(set(o) < set(c) for o in unique if o is not c)
+    ]
+
+
+def normalize(prereq_str: str) -> str:
+    """Canonical form used as the memoization key."""
+    return " ".join(prereq_str.upper().split())
+
+
+@lru_cache(maxsize=65536)
+def _parse_normalized(text: str) -> tuple[tuple[str, tuple[str, ...]], ...]:
+    if text in EMPTY_VALUES:
+        return ()
+    clauses = to_groups(simplify(_Parser(text).parse()))
+    return tuple(("OR" if len(c) > 1 else "AND", c) for c in clauses)
+
+
+def parse_expression(prereq_str: str) -> Node:
+    """Parse a prerequisite string into a simplified AST (not memoized)."""
+    return simplify(_Parser(normalize(prereq_str)).parse())
+
+
+def parse_prerequisites(prereq_str):
+    """
+    Returns a list of groups for a course.
+    Each group: {'type': 'AND'/'OR', 'courses': [course_codes]}
+    Parsed results are memoized by the normalized string.
+    """
+    if not prereq_str:
+        return []
+    return [
+        {"type": group_type, "courses": list(codes)}
+        for group_type, codes in _parse_normalized(normalize(prereq_str))
+    ]
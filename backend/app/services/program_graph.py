@@ -0,0 +1,533 @@
+# backend/app/services/program_graph.py
+from array import array
+from typing import TYPE_CHECKING, Iterable, Iterator, Optional, Sequence
+
+import orjson
+from sqlalchemy import select
+from sqlalchemy.orm import Session, aliased
+
+from backend.app.core.cache import LRUCache
+from backend.app.core.config import settings
+from backend.app.db import models
+
+# numpy builds the CSR arrays and is loaded with the first graph; networkx
+# is only used for optional analytics (ProgramGraph.to_networkx)
+if TYPE_CHECKING:
+    import networkx as nx
+    import numpy as np
+
+
+# Bump when the serialized payload format changes so clients drop old ETags
+GRAPH_FORMAT_VERSION = 3
+
+
+# Edges are packed into int64 keys (source << 32 | target) to sort and dedupe
+_SHIFT = 32
+_LOW = (1 << _SHIFT) - 1
+
+
+def _int_array(values: "np.ndarray") -> array:
+    """numpy integers as a compact stdlib array (fast to index from Python)."""
+    import numpy as np
+
+    out = array("i")
+    out.frombytes(np.ascontiguousarray(values, dtype=np.int32).tobytes())
+    return out
+
+
+def _csr(n: int, keys: "np.ndarray") -> tuple[array, array]:
+    """(row pointers, column indices) of sorted packed row -> column keys."""
+    import numpy as np
+
+    pointers = np.searchsorted(keys >> _SHIFT, np.arange(n + 1))
+    return _int_array(pointers), _int_array(keys & _LOW)
+
+
+class ProgramGraph:
+    """
+    Compact prerequisite graph of one program. Nodes are dense ints:
+    courses first (ordered by course_id, so a course's node is also its
+    bit in services.eligibility.Requirements), then AND/OR group nodes,
+    then courses of other programs that edges point at. Edges are stored
+    once per direction in CSR form: the successors of node u are
+    succ[succ_ptr[u]:succ_ptr[u + 1]], predecessors likewise. Edges run
+    prerequisite -> course and member -> group -> course, as in the API.
+
+    Instances are immutable; with_edges returns an updated copy.
+    """
+
+    __slots__ = (
+        "ids",
+        "labels",
+        "course_ids",
+        "credits",
+        "n_groups",
+        "succ_ptr",
+        "succ",
+        "pred_ptr",
+        "pred",
+        "_index",
+    )
+
+    @classmethod
+    def from_rows(
+        cls,
+        courses: Iterable[tuple],
+        groups: Iterable[tuple[str, str]] = (),
+        edges: Iterable[tuple[str, str]] = (),
+    ) -> "ProgramGraph":
+        """
+        Build from (course_id, code, name, credits) rows in course_id order,
+        (node id, "AND"/"OR") group rows and (source id, target id) edges.
+        Duplicate edges collapse into one.
+        """
+        import numpy as np
+
+        graph = cls.__new__(cls)
+        course_ids, codes, names, credits = list(zip(*courses)) or [()] * 4
+        graph.course_ids = array("q", course_ids)
+        # Courses without credits weigh nothing against a term's credit cap
+        graph.credits = array("i", [c or 0 for c in credits])
+        ids, labels = list(codes), list(names)
+        index = dict(zip(ids, range(len(ids))))
+
+        def add_nodes(nodes: dict) -> None:
+            index.update(zip(nodes, range(len(ids), len(ids) + len(nodes))))
+            ids.extend(nodes)
+            labels.extend(nodes.values())
+
+        add_nodes({node_id: label for node_id, label in groups if node_id not in index})
+        graph.n_groups = len(ids) - len(course_ids)
+
+        sources, targets = list(zip(*edges)) or [(), ()]
+        # Courses of other programs become plain nodes, in order of appearance
+        external = set(sources).union(targets).difference(index)
+        if external:
+            ordered = [node_id for node_id in sources + targets if node_id in external]
+            add_nodes({node_id: node_id for node_id in ordered})
+
+        graph.ids, graph.labels, graph._index = ids, labels, index
+        graph._set_edges(
+            np.fromiter(map(index.__getitem__, sources), np.int64, len(sources)),
+            np.fromiter(map(index.__getitem__, targets), np.int64, len(targets)),
+        )
+        return graph
+
+    def _set_edges(self, sources: "np.ndarray", targets: "np.ndarray") -> None:
+        """CSR arrays both ways from parallel node arrays; duplicates collapse."""
+        import numpy as np
+
+        keys = np.unique(sources << _SHIFT | targets)
+        n = len(self.ids)
+        self.succ_ptr, self.succ = _csr(n, keys)
+        self.pred_ptr, self.pred = _csr(
+            n, np.sort((keys & _LOW) << _SHIFT | keys >> _SHIFT)
+        )
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @property
+    def n_courses(self) -> int:
+        return len(self.course_ids)
+
+    @property
+    def n_edges(self) -> int:
+        return len(self.succ)
+
+    def is_group(self, i: int) -> bool:
+        return self.n_courses <= i < self.n_courses + self.n_groups
+
+    def node_types(self) -> list[str]:
+        """"course" or "group" per node (other programs' courses are courses)."""
+        n, g = self.n_courses, self.n_groups
+        return ["course"] * n + ["group"] * g + ["course"] * (len(self.ids) - n - g)
+
+    def position(self, node_id: str) -> Optional[int]:
+        return self._index.get(node_id)
+
+    def successors(self, i: int) -> array:
+        return self.succ[self.succ_ptr[i] : self.succ_ptr[i + 1]]
+
+    def predecessors(self, i: int) -> array:
+        return self.pred[self.pred_ptr[i] : self.pred_ptr[i + 1]]
+
+    def has_edge(self, u: int, v: int) -> bool:
+        return v in self.successors(u)
+
+    def edge_sources(self) -> list[int]:
+        """Source node of every edge, aligned with succ (the targets)."""
+        return self._edge_keys()[0].tolist()
+
+    def _edge_keys(self) -> tuple["np.ndarray", "np.ndarray"]:
+        """(sources, packed keys) of every edge as int64 arrays."""
+        import numpy as np
+
+        degrees = np.diff(np.frombuffer(self.succ_ptr, dtype=np.int32))
+        sources = np.repeat(np.arange(len(self.ids), dtype=np.int64), degrees)
+        targets = np.frombuffer(self.succ, dtype=np.int32).astype(np.int64)
+        return sources, sources << _SHIFT | targets
+
+    def edges(self) -> Iterator[tuple[str, str]]:
+        """(source id, target id) of every edge."""
+        ids = self.ids
+        return ((ids[u], ids[v]) for u, v in zip(self.edge_sources(), self.succ))
+
+    def with_edges(
+        self,
+        added: Iterable[tuple[int, int]] = (),
+        removed: Iterable[tuple[int, int]] = (),
+    ) -> "ProgramGraph":
+        """A copy with node-position edges added and removed; nodes are shared."""
+        import numpy as np
+
+        def packed(edges):
+            return np.array([u << _SHIFT | v for u, v in edges], dtype=np.int64)
+
+        keys = self._edge_keys()[1]
+        keys = np.concatenate([keys[~np.isin(keys, packed(removed))], packed(added)])
+
+        graph = ProgramGraph.__new__(ProgramGraph)
+        for name in ("ids", "labels", "course_ids", "credits", "n_groups", "_index"):
+            setattr(graph, name, getattr(self, name))
+        graph._set_edges(keys >> _SHIFT, keys & _LOW)
+        return graph
+
+    def to_networkx(self) -> "nx.DiGraph":
+        """networkx copy for ad-hoc analytics; no request path uses it."""
+        import networkx as nx
+
+        G = nx.DiGraph()
+        for i, (node_id, kind) in enumerate(zip(self.ids, self.node_types())):
+            G.add_node(node_id, label=self.labels[i], type=kind)
+            if i < self.n_courses:
+                G.nodes[node_id].update(
+                    course_id=self.course_ids[i], credits=self.credits[i]
+                )
+        G.add_edges_from(self.edges())
+        return G
+
+
+class CompiledGraph:
+    """
+    A program's prerequisite graph plus its serialized Cytoscape JSON.
+    Derived structures (e.g. eligibility bitsets) are attached lazily and
+    live exactly as long as the cached graph.
+    """
+
+    __slots__ = (
+        "program_id",
+        "version",
+        "graph",
+        "payload",
+        "requirements",
+        "reachability",
+    )
+
+    def __init__(
+        self, program_id: int, version: int, graph: ProgramGraph, payload: bytes
+    ):
+        self.program_id = program_id
+        self.version = version
+        self.graph = graph
+        self.payload = payload
+        self.requirements = None
+        self.reachability = None
+
+
+# (program_id, graph_version) -> CompiledGraph. Writes bump the version, so
+# stale entries are never looked up again and simply age out of the LRU.
+graph_cache = LRUCache(maxsize=settings.GRAPH_CACHE_SIZE)
+
+# program_id -> newest graph_version compiled here; the base for replaying
+# the graph_changes log instead of rebuilding
+latest_versions = LRUCache(maxsize=settings.GRAPH_CACHE_SIZE)
+
+
+def get_program_version(db: Session, program_id: int) -> Optional[int]:
+    """Current graph_version of a program, or None if it does not exist."""
+    return db.scalar(
+        select(models.Program.graph_version).where(
+            models.Program.program_id == program_id
+        )
+    )
+
+
+def graph_etag(program_id: int, version: int) -> str:
+    """Strong ETag for a program's graph at a given graph_version."""
+    return f'"graph-{program_id}-{version}-f{GRAPH_FORMAT_VERSION}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """True if an If-None-Match header value matches etag (weak comparison)."""
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == etag:
+            return True
+    return False
+
+
+def build_graph(db: Session, program_id: int) -> Optional[ProgramGraph]:
+    """
+    Load a program's courses, prerequisites and prerequisite groups with a
+    fixed number of queries. Returns None if the program has no courses.
+    """
+
+    # 1. Get all courses for this program (one query, only the columns we need)
+    courses = db.execute(
+        select(
+            models.Course.course_id,
+            models.Course.course_code,
+            models.Course.course_name,
+            models.Course.credits,
+        )
+        .where(models.Course.program_id == program_id)
+        .order_by(models.Course.course_id)
+    ).all()
+    if not courses:
+        return None
+
+    # 2. Edges: prereq.course_code -> course.course_code, resolved in SQL so
+    # the number of queries does not grow with the number of edges
+    target = aliased(models.Course)
+    source = aliased(models.Course)
+    edges = db.execute(
+        select(source.course_code, target.course_code)
+        .select_from(models.Prerequisite)
+        .join(target, models.Prerequisite.course_id == target.course_id)
+        .join(source, models.Prerequisite.prereq_course_id == source.course_id)
+        .where(target.program_id == program_id)
+        .order_by(models.Prerequisite.prereq_id)
+    ).all()
+
+    # 3. Groups: one joined query for every group and member in the program;
+    # each group becomes a node "group-<group_id>" with edges
+    # member -> group -> course
+    member = aliased(models.Course)
+    rows = db.execute(
+        select(
+            models.PrerequisiteGroup.group_id,
+            models.PrerequisiteGroup.type,
+            target.course_code,
+            member.course_code,
+        )
+        .select_from(models.PrerequisiteGroup)
+        .join(target, models.PrerequisiteGroup.course_id == target.course_id)
+        .outerjoin(
+            models.PrerequisiteGroupMember,
+            models.PrerequisiteGroupMember.group_id
+            == models.PrerequisiteGroup.group_id,
+        )
+        .outerjoin(
+            member, models.PrerequisiteGroupMember.prereq_course_id == member.course_id
+        )
+        .where(target.program_id == program_id)
+        .order_by(
+            models.PrerequisiteGroup.group_id,
+            models.PrerequisiteGroupMember.group_member_id,
+        )
+    ).all()
+    groups = {}
+    for group_id, group_type, target_code, member_code in rows:
+        group_node = f"group-{group_id}"
+        if group_node not in groups:
+            groups[group_node] = group_type
+            edges.append((group_node, target_code))
+        if member_code is not None:
+            edges.append((member_code, group_node))
+
+    return ProgramGraph.from_rows(courses, groups.items(), edges)
+
+
+def to_cytoscape(graph: ProgramGraph) -> dict:
+    """
+    Convert a program graph to Cytoscape.js elements. Reference form of the
+    cached payload (see cytoscape_payload), which never builds these dicts.
+    """
+    nodes = [
+        {"data": {"id": node_id, "label": label, "type": kind}}
+        for node_id, label, kind in zip(graph.ids, graph.labels, graph.node_types())
+    ]
+    edges = [{"data": {"source": u, "target": v}} for u, v in graph.edges()]
+    return {"nodes": nodes, "edges": edges}
+
+
+_NODE = b'{"data":{"id":"%b","label":%b,"type":"%b"}}'
+
+
+def _json_strings(values: Sequence[str]) -> list[bytes]:
+    """JSON-escaped contents (without quotes) of each string."""
+    dumps = orjson.dumps
+    return [dumps(value)[1:-1] for value in values]
+
+
+def cytoscape_payload(
+    ids: Sequence[str],
+    labels: Sequence[Optional[str]],
+    types: Sequence[str],
+    sources: Sequence[int],
+    targets: Sequence[int],
+) -> bytes:
+    """
+    Serialized to_cytoscape output for a graph given as parallel node arrays
+    and edges sources[k] -> targets[k] (node positions). Written straight
+    to bytes: each string is escaped once and no per-node dicts are built.
+    """
+    encoded = _json_strings(ids)
+    names = [
+        b"null" if label is None else b'"' + text + b'"'
+        for label, text in zip(labels, _json_strings([lb or "" for lb in labels]))
+    ]
+    unique_types = list(set(types))
+    kinds = dict(zip(unique_types, _json_strings(unique_types)))
+    nodes = b",".join(
+        [
+            _NODE % (node_id, name, kinds[kind])
+            for node_id, name, kind in zip(encoded, names, types)
+        ]
+    )
+    # Every edge is "<source prefix><target suffix>"; both are built per node
+    source = [b'{"data":{"source":"' + e + b'","target":"' for e in encoded]
+    target = [e + b'"}}' for e in encoded]
+    edges = b",".join([source[u] + target[v] for u, v in zip(sources, targets)])
+    return b'{"nodes":[' + nodes + b'],"edges":[' + edges + b"]}"
+
+
+def _compile(program_id: int, version: int, graph: ProgramGraph) -> CompiledGraph:
+    payload = cytoscape_payload(
+        graph.ids, graph.labels, graph.node_types(), graph.edge_sources(), graph.succ
+    )
+    return CompiledGraph(program_id, version, graph, payload)
+
+
+def _edge_still_stored(db: Session, change) -> bool:
+    """True if another row still backs a removed edge (duplicate rows)."""
+    if change.group_id is None:
+        stmt = select(models.Prerequisite.prereq_id).where(
+            models.Prerequisite.course_id == change.course_id,
+            models.Prerequisite.prereq_course_id == change.prereq_course_id,
+        )
+    else:
+        stmt = select(models.PrerequisiteGroupMember.group_member_id).where(
+            models.PrerequisiteGroupMember.group_id == change.group_id,
+            models.PrerequisiteGroupMember.prereq_course_id == change.prereq_course_id,
+        )
+    return db.scalar(stmt.limit(1)) is not None
+
+
+def apply_changes(
+    db: Session, previous: CompiledGraph, version: int
+) -> Optional[CompiledGraph]:
+    """
+    Replay the graph_changes log from previous.version up to version on a
+    copy of previous, updating its derived structures (eligibility
+    requirements, reachability index) for just the touched courses.
+    Returns None when the log does not cover every version in between or a
+    version changed more than edges; the caller then rebuilds.
+    """
+    changes = db.execute(
+        select(
+            models.GraphChange.version,
+            models.GraphChange.op,
+            models.GraphChange.course_id,
+            models.GraphChange.group_id,
+            models.GraphChange.prereq_course_id,
+        )
+        .where(
+            models.GraphChange.program_id == previous.program_id,
+            models.GraphChange.version > previous.version,
+            models.GraphChange.version <= version,
+        )
+        .order_by(models.GraphChange.change_id)
+    ).all()
+    if {c.version for c in changes} != set(range(previous.version + 1, version + 1)):
+        return None
+
+    graph = previous.graph
+    courses = {course_id: i for i, course_id in enumerate(graph.course_ids)}
+    # (source, node) -> whether the edge exists after the changes so far
+    present = {}
+    touched, added, removed = set(), [], False
+    for change in changes:
+        if change.op not in ("add", "remove"):
+            return None
+        source = courses.get(change.prereq_course_id)
+        if change.group_id is None:
+            node = target = courses.get(change.course_id)
+        else:
+            node = graph.position(f"group-{change.group_id}")
+            successors = graph.successors(node) if node is not None else ()
+            target = successors[0] if successors else None
+        if source is None or target is None:
+            return None
+
+        edge = (source, node)
+        if change.op == "add":
+            present[edge] = True
+            added.append((source, target))
+        else:
+            removed = True
+            exists = present.get(edge)
+            if exists is None:
+                exists = graph.has_edge(source, node)
+            if exists and not _edge_still_stored(db, change):
+                present[edge] = False
+        touched.add(target)
+
+    graph = graph.with_edges(
+        added=[edge for edge, on in present.items() if on],
+        removed=[edge for edge, on in present.items() if not on],
+    )
+    compiled = _compile(previous.program_id, version, graph)
+    if previous.requirements is not None:
+        # Course nodes and requirement bits share positions
+        reqs = previous.requirements.updated(graph, touched)
+        compiled.requirements = reqs
+        if previous.reachability is not None:
+            compiled.reachability = previous.reachability.updated(
+                reqs, added, removed
+            )
+    return compiled
+
+
+def get_compiled_graph(
+    db: Session, program_id: int, version: Optional[int] = None
+) -> Optional[CompiledGraph]:
+    """
+    Return the compiled graph for a program, rebuilding it only when the
+    program's graph_version moved since it was cached, and then preferably
+    by replaying the change log on the newest cached version. Returns None
+    if the program does not exist or has no courses.
+    Pass version if the caller already looked it up.
+    """
+    if version is None:
+        version = get_program_version(db, program_id)
+    if version is None:
+        return None
+
+    compiled = graph_cache.get((program_id, version))
+    if compiled is not None:
+        return compiled
+
+    # Peeks: finding the replay base must not count as a cache hit or miss
+    previous_version = latest_versions.peek(program_id)
+    previous = None
+    if previous_version is not None and previous_version < version:
+        previous = graph_cache.peek((program_id, previous_version))
+    if previous is not None:
+        compiled = apply_changes(db, previous, version)
+    if compiled is None:
+        graph = build_graph(db, program_id)
+        if graph is None:
+            return None
+        compiled = _compile(program_id, version, graph)
+
+    # A version bumped by this session's own uncommitted writes may be
+    # rolled back and reused, so it is never cached
+    if program_id not in db.info.get("graph_programs", ()):
+        graph_cache.set((program_id, version), compiled)
+        if previous_version is None or previous_version < version:
+            latest_versions.set(program_id, version)
+    return compiled
@@ -0,0 +1,196 @@
+# backend/app/services/reachability.py
+"""
+Per-program reachability index over the course-level prerequisite DAG.
+
+Every course gets two bitset rows over the program's course positions (see
+services.eligibility.Requirements): all of its transitive prerequisites and
+everything downstream of it. Membership ("is A a prerequisite of B, at any
+depth?") is a shift and a mask. Members of AND and OR groups both count as
+prerequisites here.
+
+The index is built once per graph_version next to the compiled graph and
+can absorb added edges in place (add_edge) without a rebuild. It also backs
+the write-time check that rejects prerequisite edges closing a cycle.
+"""
+from typing import Optional
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from backend.app.db import models
+from backend.app.services import eligibility
+from backend.app.services.eligibility import Requirements, bit_positions
+
+
+class PrerequisiteCycleError(ValueError):
+    """Raised when a new prerequisite edge would make the program graph cyclic."""
+
+
+def prerequisite_masks(reqs: Requirements) -> list[int]:
+    """Direct prerequisites of every course, AND and OR alike, as bitsets."""
+    masks = []
+    for required, any_of in zip(reqs.required, reqs.any_of):
+        for m in any_of:
+            required |= m
+        masks.append(required)
+    return masks
+
+
+def topological_order(preds: list[int]) -> tuple[list[int], list[int]]:
+    """
+    (Kahn order, successor bitsets) for direct-prerequisite bitsets.
+    Courses on a cycle, or downstream of one, are left out of the order.
+    """
+    n = len(preds)
+    succ = [0] * n
+    indegree = [0] * n
+    for i, mask in enumerate(preds):
+        for j in bit_positions(mask):
+            succ[j] |= 1 << i
+            indegree[i] += 1
+
+    order = [i for i in range(n) if not indegree[i]]
+    for i in order:
+        for s in bit_positions(succ[i]):
+            indegree[s] -= 1
+            if not indegree[s]:
+                order.append(s)
+    return order, succ
+
+
+class ReachabilityIndex:
+    """Transitive-closure rows: ancestors[i] and descendants[i] are bitsets."""
+
+    __slots__ = ("ancestors", "descendants")
+
+    def __init__(self, preds: list[int]):
+        order, succ = topological_order(preds)
+        n = len(preds)
+        self.ancestors = [0] * n
+        self.descendants = [0] * n
+        if len(order) == n:
+            for i in order:
+                for p in bit_positions(preds[i]):
+                    self.ancestors[i] |= self.ancestors[p] | 1 << p
+            for i in reversed(order):
+                for s in bit_positions(succ[i]):
+                    self.descendants[i] |= self.descendants[s] | 1 << s
+        else:
+            # Cyclic catalog data: propagate to a fixpoint instead
+            self.ancestors = list(preds)
+            changed = True
+            while changed:
+                changed = False
+                for i in range(n):
+                    closure = self.ancestors[i]
+                    for p in bit_positions(self.ancestors[i]):
+                        closure |= self.ancestors[p]
+                    if closure != self.ancestors[i]:
+                        self.ancestors[i] = closure
+                        changed = True
+            for i, mask in enumerate(self.ancestors):
+                for p in bit_positions(mask):
+                    self.descendants[p] |= 1 << i
+
+    def copy(self) -> "ReachabilityIndex":
+        index = ReachabilityIndex.__new__(ReachabilityIndex)
+        index.ancestors = list(self.ancestors)
+        index.descendants = list(self.descendants)
+        return index
+
+    def updated(
+        self, reqs: Requirements, added: list[tuple[int, int]], removed: bool
+    ) -> "ReachabilityIndex":
+        """
+        Index after edge changes: added (u, v) edges are folded into a copy;
+        a removal can shrink the closure, so it rebuilds from reqs.
+        """
+        if removed:
+            return ReachabilityIndex(prerequisite_masks(reqs))
+        index = self.copy()
+        for u, v in added:
+            index.add_edge(u, v)
+        return index
+
+    def is_ancestor(self, a: int, b: int) -> bool:
+        """True if course a is a (transitive) prerequisite of course b."""
+        return bool(self.ancestors[b] >> a & 1)
+
+    def is_descendant(self, a: int, b: int) -> bool:
+        """True if course a is (transitively) downstream of course b."""
+        return bool(self.descendants[b] >> a & 1)
+
+    def add_edge(self, u: int, v: int) -> None:
+        """Record that u became a direct prerequisite of v."""
+        up = self.ancestors[u] | 1 << u
+        down = self.descendants[v] | 1 << v
+        for a in bit_positions(up):
+            self.descendants[a] |= down
+        for d in bit_positions(down):
+            self.ancestors[d] |= up
+
+
+def get_reachability(
+    db: Session, program_id: int, version: Optional[int] = None
+) -> Optional[tuple[Requirements, ReachabilityIndex]]:
+    """
+    Compiled requirements and reachability index of a program, cached with
+    its compiled graph. None if the program does not exist or has no courses.
+    """
+    compiled = eligibility.get_compiled(db, program_id, version)
+    if compiled is None:
+        return None
+    if compiled.reachability is None:
+        compiled.reachability = ReachabilityIndex(
+            prerequisite_masks(compiled.requirements)
+        )
+    return compiled.requirements, compiled.reachability
+
+
+@event.listens_for(Session, "before_flush")
+def _reject_prerequisite_cycles(session, flush_context, instances):
+    """
+    Check new Prerequisite and PrerequisiteGroupMember rows against the
+    program's reachability index before they are written: u -> v closes a
+    cycle iff v already reaches u. Edges of one flush are checked together.
+    """
+    new_edges = [
+        obj
+        for obj in session.new
+        if isinstance(obj, (models.Prerequisite, models.PrerequisiteGroupMember))
+    ]
+    if not new_edges:
+        return
+
+    with session.no_autoflush:
+        by_program = {}
+        for obj in new_edges:
+            if isinstance(obj, models.Prerequisite):
+                target_id = obj.course_id
+            else:
+                group = obj.group or session.get(models.PrerequisiteGroup, obj.group_id)
+                target_id = group.course_id if group is not None else None
+            target = session.get(models.Course, target_id) if target_id else None
+            if target is None or obj.prereq_course_id is None:
+                continue
+            by_program.setdefault(target.program_id, []).append(
+                (obj.prereq_course_id, target)
+            )
+
+        for program_id, edges in by_program.items():
+            found = get_reachability(session, program_id)
+            if found is None:
+                continue
+            reqs, index = found
+            index = index.copy()
+            for source_id, target in edges:
+                u, v = reqs.index.get(source_id), reqs.index.get(target.course_id)
+                if u is None or v is None:
+                    # Course added in this flush or outside the program
+                    continue
+                if u == v or index.is_ancestor(v, u):
+                    raise PrerequisiteCycleError(
+                        f"{reqs.codes[u]} -> {reqs.codes[v]} would create a "
+                        "prerequisite cycle"
+                    )
+                index.add_edge(u, v)
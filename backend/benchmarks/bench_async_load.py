@@ -0,0 +1,77 @@
+# backend/benchmarks/bench_async_load.py
+"""
+Sync vs. async API throughput under many concurrent clients.
+
+Start the same app twice against the same database, once per mode:
+
+    DB_ASYNC=false uvicorn backend.app.main:app --port 8001
+    DB_ASYNC=true  uvicorn backend.app.main:app --port 8002
+
+then drive both with 500 concurrent keep-alive clients:
+
+    python -m backend.benchmarks.bench_async_load \
+        http://localhost:8001 http://localhost:8002 --path /graph/1 --clients 500
+
+Each client loops on GET <path> for --seconds; prints requests/s and
+p50/p99 latency per server.
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+import httpx
+
+
+async def _client(http: httpx.AsyncClient, url: str, deadline: float, latencies, errors):
+    while time.perf_counter() < deadline:
+        started = time.perf_counter()
+        try:
+            response = await http.get(url)
+            if response.status_code >= 500:
+                errors.append(response.status_code)
+                continue
+        except httpx.HTTPError as exc:
+            errors.append(type(exc).__name__)
+            continue
+        latencies.append(time.perf_counter() - started)
+
+
+async def run(base_url: str, path: str, clients: int, seconds: float):
+    latencies, errors = [], []
+    limits = httpx.Limits(max_connections=clients, max_keepalive_connections=clients)
+    async with httpx.AsyncClient(limits=limits, timeout=30) as http:
+        await http.get(base_url + path)  # warm caches and connections
+        deadline = time.perf_counter() + seconds
+        await asyncio.gather(
+            *(
+                _client(http, base_url + path, deadline, latencies, errors)
+                for _ in range(clients)
+            )
+        )
+
+    if not latencies:
+        print(f"{base_url}: no successful requests ({len(errors)} errors)")
+        return
+    quantiles = statistics.quantiles(latencies, n=100)
+    print(
+        f"{base_url}: {len(latencies) / seconds:8,.0f} req/s  "
+        f"p50 {quantiles[49] * 1000:7.1f} ms  p99 {quantiles[98] * 1000:7.1f} ms  "
+        f"errors {len(errors)}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("base_urls", nargs="+")
+    parser.add_argument("--path", default="/graph/1")
+    parser.add_argument("--clients", type=int, default=500)
+    parser.add_argument("--seconds", type=float, default=10)
+    args = parser.parse_args()
+
+    for base_url in args.base_urls:
+        asyncio.run(run(base_url.rstrip("/"), args.path, args.clients, args.seconds))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+# backend/benchmarks/bench_degree_planner.py
+"""
+Degree planner latency and plan quality on synthetic programs.
+
+    python -m backend.benchmarks.bench_degree_planner --sizes 100 200 400 800
+
+For each program size, plans from an empty transcript and from a half-way
+transcript at a few credit caps. Reports the median planning time, the
+number of terms and the lower bound (no plan can be shorter). Plans for a
+400-course program must stay under 100 ms.
+"""
+import argparse
+import statistics
+import time
+
+from backend.app.services import eligibility, planner
+from backend.benchmarks.synthetic import program_graph
+
+BUDGET_MS = 100
+BUDGET_COURSES = 400
+
+
+def _median_ms(fn, repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        times.append((time.perf_counter() - started) * 1000)
+    return statistics.median(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 200, 400, 800])
+    parser.add_argument("--caps", type=int, nargs="+", default=[12, 15, 18])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'courses':>7} {'start':>6} {'cap':>4} {'median':>9} {'terms':>6} {'bound':>6}")
+    slowest = 0.0
+    for size in args.sizes:
+        reqs = eligibility.compile_requirements(program_graph(size))
+        for label, done in [
+            ("empty", 0),
+            ("half", reqs.mask(reqs.course_ids[: size // 2])),
+        ]:
+            for cap in args.caps:
+                ms = _median_ms(lambda: planner.plan_terms(reqs, done, cap), args.repeat)
+                plan = planner.plan_terms(reqs, done, cap)
+                print(
+                    f"{size:>7} {label:>6} {cap:>4} {ms:>7.1f}ms "
+                    f"{len(plan.terms):>6} {plan.lower_bound:>6}"
+                )
+                if size == BUDGET_COURSES:
+                    slowest = max(slowest, ms)
+
+    if BUDGET_COURSES in args.sizes:
+        verdict = "OK" if slowest < BUDGET_MS else "OVER BUDGET"
+        print(f"{BUDGET_COURSES} courses: slowest {slowest:.1f}ms vs {BUDGET_MS}ms budget: {verdict}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+# backend/benchmarks/bench_graph_serialization.py
+"""
+Graph payload serialization: per-node dicts vs bytes built from arrays.
+
+    python -m backend.benchmarks.bench_graph_serialization --sizes 250 500 700 1000
+
+For each synthetic program, times the three ways a graph response can be
+produced from the in-memory graph:
+
+    encoder  to_cytoscape dicts through FastAPI's jsonable_encoder + json
+    dicts    to_cytoscape dicts through json.dumps (the old cached payload)
+    arrays   program_graph._compile: node/edge arrays written straight to
+             bytes with orjson (the current cached payload)
+
+700 courses gives about 2,000 nodes; the arrays path must beat the dict
+paths by at least 3x there.
+"""
+import argparse
+import json
+import statistics
+import time
+
+from fastapi.encoders import jsonable_encoder
+
+from backend.app.services import program_graph
+from backend.benchmarks.synthetic import program_graph as synthetic_graph
+
+MIN_SPEEDUP = 3.0
+BUDGET_COURSES = 700
+
+
+def _median_ms(fn, repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        times.append((time.perf_counter() - started) * 1000)
+    return statistics.median(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[250, 500, 700, 1000])
+    parser.add_argument("--repeat", type=int, default=15)
+    args = parser.parse_args()
+
+    print(
+        f"{'courses':>7} {'nodes':>6} {'edges':>6} {'KiB':>6} "
+        f"{'encoder':>9} {'dicts':>9} {'arrays':>9} {'speedup':>8}"
+    )
+    speedup_at_budget = None
+    for size in args.sizes:
+        G = synthetic_graph(size)
+        payload = program_graph._compile(0, 0, G).payload
+        assert json.loads(payload) == program_graph.to_cytoscape(G)
+
+        encoder = _median_ms(
+            lambda: json.dumps(jsonable_encoder(program_graph.to_cytoscape(G))),
+            args.repeat,
+        )
+        dicts = _median_ms(
+            lambda: json.dumps(
+                program_graph.to_cytoscape(G), separators=(",", ":")
+            ).encode("utf-8"),
+            args.repeat,
+        )
+        arrays = _median_ms(lambda: program_graph._compile(0, 0, G), args.repeat)
+        speedup = dicts / arrays
+        print(
+            f"{size:>7} {len(G):>6} {G.n_edges:>6} "
+            f"{len(payload) / 1024:>6.0f} {encoder:>7.1f}ms {dicts:>7.1f}ms "
+            f"{arrays:>7.1f}ms {speedup:>7.1f}x"
+        )
+        if size == BUDGET_COURSES:
+            speedup_at_budget = speedup
+
+    if speedup_at_budget is not None:
+        verdict = "OK" if speedup_at_budget >= MIN_SPEEDUP else "TOO SLOW"
+        print(
+            f"{BUDGET_COURSES} courses: {speedup_at_budget:.1f}x vs dicts, "
+            f"target {MIN_SPEEDUP:.0f}x: {verdict}"
+        )
+
+
+if __name__ == "__main__":
+    main()
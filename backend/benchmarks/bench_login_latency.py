@@ -0,0 +1,78 @@
+# backend/benchmarks/bench_login_latency.py
+"""
+Login latency under a registration/login burst, with graph traffic alongside.
+
+    uvicorn backend.app.main:app --port 8001
+    python -m backend.benchmarks.bench_login_latency http://localhost:8001 \
+        --logins 40 --graph-clients 20 --seconds 10
+
+Registers one user, then runs --logins concurrent clients looping on
+POST /auth/login next to --graph-clients looping on GET --graph-path.
+Prints p50/p99 for both, plus the server's /metrics password_hashing
+counters. Compare PASSWORD_HASH_WORKERS=0 (inline) with a sized pool.
+"""
+import argparse
+import asyncio
+import statistics
+import time
+import uuid
+
+import httpx
+
+
+async def _loop(send, deadline: float, latencies, errors):
+    while time.perf_counter() < deadline:
+        started = time.perf_counter()
+        response = await send()
+        if response.status_code >= 400:
+            errors.append(response.status_code)
+            continue
+        latencies.append(time.perf_counter() - started)
+
+
+def _report(label: str, latencies, errors, seconds: float):
+    if len(latencies) < 2:
+        print(f"{label:<6} no successful requests ({len(errors)} errors)")
+        return
+    q = statistics.quantiles(latencies, n=100)
+    print(
+        f"{label:<6} {len(latencies) / seconds:7,.1f} req/s  "
+        f"p50 {q[49] * 1000:8.1f} ms  p99 {q[98] * 1000:8.1f} ms  errors {len(errors)}"
+    )
+
+
+async def run(args):
+    user = {"email": f"bench-{uuid.uuid4().hex[:8]}@example.com", "password": "P@ssw0rd!"}
+    async with httpx.AsyncClient(base_url=args.base_url, timeout=60) as http:
+        r = await http.post("/auth/register", json={**user, "role": "student"})
+        r.raise_for_status()
+
+        login, graph = ([], []), ([], [])
+        deadline = time.perf_counter() + args.seconds
+        await asyncio.gather(
+            *(
+                _loop(lambda: http.post("/auth/login", json=user), deadline, *login)
+                for _ in range(args.logins)
+            ),
+            *(
+                _loop(lambda: http.get(args.graph_path), deadline, *graph)
+                for _ in range(args.graph_clients)
+            ),
+        )
+        _report("login", *login, args.seconds)
+        _report("graph", *graph, args.seconds)
+        print((await http.get("/metrics")).json()["password_hashing"])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("base_url")
+    parser.add_argument("--logins", type=int, default=40)
+    parser.add_argument("--graph-clients", type=int, default=20)
+    parser.add_argument("--graph-path", default="/graph/1")
+    parser.add_argument("--seconds", type=float, default=10)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
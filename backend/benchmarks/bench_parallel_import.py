@@ -0,0 +1,63 @@
+# backend/benchmarks/bench_parallel_import.py
+"""
+Serial vs. process-pool catalog import.
+
+    python -m backend.benchmarks.bench_parallel_import \
+        --db sqlite:////tmp/bench_import.db --programs 64 --courses 200
+
+Point --db at a scratch Postgres database for realistic numbers; SQLite
+serializes writers, so it only shows the parse/partition overlap.
+Each run starts from an empty schema.
+"""
+import argparse
+import os
+import tempfile
+
+from sqlalchemy import create_engine
+
+from backend.app.db import models
+from backend.app.services.import_csv import import_csv, import_csv_parallel
+from backend.benchmarks.synthetic import write_catalog
+
+
+def _reset(database_url: str) -> None:
+    engine = create_engine(database_url)
+    models.Base.metadata.drop_all(engine)
+    models.Base.metadata.create_all(engine)
+    engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--db", required=True, help="scratch database URL")
+    parser.add_argument("--programs", type=int, default=64)
+    parser.add_argument("--courses", type=int, default=200)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--chunk-size", type=int, default=5000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "catalog.csv")
+        write_catalog(path, args.programs, args.courses)
+        print(f"{args.programs} programs x {args.courses} courses")
+
+        _reset(args.db)
+        serial = import_csv(
+            path, chunk_size=args.chunk_size, bind=create_engine(args.db)
+        )
+        print(f"serial      {serial.seconds:7.2f}s  {serial.rows_per_sec:10,.0f} rows/s")
+
+        for workers in args.workers:
+            _reset(args.db)
+            report = import_csv_parallel(
+                path, workers=workers, chunk_size=args.chunk_size, database_url=args.db
+            )
+            print(
+                f"workers={workers:<3} {report.seconds:7.2f}s  "
+                f"{report.rows_per_sec:10,.0f} rows/s  "
+                f"x{serial.seconds / report.seconds:.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+# backend/benchmarks/bench_prereq_parser.py
+"""
+Prerequisite parsing over a large corpus of catalog-style strings.
+
+    python -m backend.benchmarks.bench_prereq_parser --strings 200000
+
+Compares the old split-on-" AND "/" OR " parser, the new parser with its
+cache disabled, and the memoized parser. Real catalogs repeat the same
+strings across sections and programs; --unique controls how many distinct
+strings the corpus draws from.
+"""
+import argparse
+import random
+import time
+
+from backend.app.services import prereq_parser
+
+SUBJECTS = ["CS", "MATH", "BIO", "CHEM", "PHYS", "ENG", "STAT", "TCHEM", "ECON", "PSY"]
+
+TEMPLATES = [
+    "{0}",
+    "{0} AND {1}",
+    "{0} OR {1}",
+    "{0} OR {1} AND {2}",
+    "({0} OR {1}) AND {2}",
+    "{0}, {1}, or {2}",
+    "{0}, {1}, and {2}",
+    "{0} and ({1} or {2} or {3})",
+    "({0} and {1}) or {2}",
+    "{0}; {1}",
+    "{0} & ({1} / {2})",
+]
+
+
+def _code(rng):
+    sep = rng.choice(["", "", " ", "-"])
+    return f"{rng.choice(SUBJECTS)}{sep}{rng.randint(100, 499)}"
+
+
+def corpus(strings: int, unique: int, seed: int = 0) -> list[str]:
+    rng = random.Random(seed)
+    distinct = [
+        rng.choice(TEMPLATES).format(*(_code(rng) for _ in range(4)))
+        for _ in range(unique)
+    ]
+    return [rng.choice(distinct) for _ in range(strings)]
+
+
+def legacy_parse(prereq_str):
+    """The original import_csv.parse_prerequisites, for comparison."""
+    if not prereq_str:
+        return []
+    prereq_str = prereq_str.upper().strip()
+    groups = []
+    for part in (p.strip() for p in prereq_str.split(" AND ")):
+        if " OR " in part:
+            groups.append({"type": "OR", "courses": [c.strip() for c in part.split(" OR ")]})
+        else:
+            groups.append({"type": "AND", "courses": [part]})
+    return groups
+
+
+def uncached_parse(prereq_str):
+    return prereq_parser._parse_normalized.__wrapped__(prereq_parser.normalize(prereq_str))
+
+
+def _time(fn, strings) -> float:
+    started = time.perf_counter()
+    for s in strings:
+        fn(s)
+    return time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--strings", type=int, default=200_000)
+    parser.add_argument("--unique", type=int, default=5_000)
+    args = parser.parse_args()
+
+    strings = corpus(args.strings, args.unique)
+    prereq_parser._parse_normalized.cache_clear()
+    for label, fn in [
+        ("legacy split", legacy_parse),
+        ("parser, no cache", uncached_parse),
+        ("parser, memoized", prereq_parser.parse_prerequisites),
+    ]:
+        seconds = _time(fn, strings)
+        print(f"{label:<18} {seconds:7.3f}s  {len(strings) / seconds:12,.0f} strings/s")
+    info = prereq_parser._parse_normalized.cache_info()
+    print(f"cache: {info.hits:,} hits, {info.misses:,} misses")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+# backend/benchmarks/bench_program_graph.py
+"""
+Program graph memory and build time: networkx.DiGraph vs ProgramGraph (CSR).
+
+    python -m backend.benchmarks.bench_program_graph --sizes 1000 5000 10000
+
+Both graphs are built from the same rows build_graph reads from the
+database (the rows themselves are not counted). Memory is what tracemalloc
+sees allocated by the build. "edit" is the copy an incremental update makes
+(DiGraph.copy vs ProgramGraph.with_edges); "compile" is
+eligibility.compile_requirements on the ProgramGraph.
+At 10k courses the CSR graph must take at least 5x less memory and build
+at least 1.5x faster.
+"""
+import argparse
+import statistics
+import time
+import tracemalloc
+
+from backend.app.services import eligibility
+from backend.app.services.program_graph import ProgramGraph
+from backend.benchmarks.synthetic import graph_rows
+
+MIN_MEMORY_RATIO = 5.0
+MIN_BUILD_RATIO = 1.5
+BUDGET_COURSES = 10000
+
+
+def networkx_graph(courses, groups, edges):
+    """The previous build_graph: one DiGraph node/edge at a time."""
+    import networkx as nx
+
+    G = nx.DiGraph()
+    for course_id, code, name, credits in courses:
+        G.add_node(code, label=name, type="course", course_id=course_id, credits=credits)
+    for node, label in groups:
+        G.add_node(node, label=label, type="group")
+    G.add_edges_from(edges)
+    return G
+
+
+def _median_ms(fn, repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        times.append((time.perf_counter() - started) * 1000)
+    return statistics.median(times)
+
+
+def _allocated(fn) -> int:
+    tracemalloc.start()
+    try:
+        kept = fn()  # noqa: F841 (held so its memory is still counted)
+        return tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 5000, 10000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    import networkx  # noqa: F401 (imported up front, not counted as graph memory)
+
+    print(
+        f"{'courses':>7} {'edges':>6} {'nx MiB':>7} {'csr MiB':>8} "
+        f"{'nx build':>9} {'csr build':>10} {'nx edit':>8} {'csr edit':>9} "
+        f"{'compile':>9}"
+    )
+    ratios = None
+    for size in args.sizes:
+        rows = graph_rows(size)
+        graph = ProgramGraph.from_rows(*rows)
+        G = networkx_graph(*rows)
+        nx_bytes = _allocated(lambda: networkx_graph(*rows))
+        csr_bytes = _allocated(lambda: ProgramGraph.from_rows(*rows))
+        nx_ms = _median_ms(lambda: networkx_graph(*rows), args.repeat)
+        csr_ms = _median_ms(lambda: ProgramGraph.from_rows(*rows), args.repeat)
+        compile_ms = _median_ms(
+            lambda: eligibility.compile_requirements(graph), args.repeat
+        )
+        edge = (graph.position(rows[0][0][1]), graph.position(rows[0][-1][1]))
+        nx_edit_ms = _median_ms(G.copy, args.repeat)
+        edit_ms = _median_ms(lambda: graph.with_edges(added=[edge]), args.repeat)
+        print(
+            f"{size:>7} {graph.n_edges:>6} {nx_bytes / 2**20:>7.1f} "
+            f"{csr_bytes / 2**20:>8.2f} {nx_ms:>7.1f}ms {csr_ms:>8.1f}ms "
+            f"{nx_edit_ms:>6.1f}ms {edit_ms:>7.1f}ms {compile_ms:>7.1f}ms"
+        )
+        if size == BUDGET_COURSES:
+            ratios = (nx_bytes / csr_bytes, nx_ms / csr_ms)
+
+    if ratios is not None:
+        memory, build = ratios
+        ok = memory >= MIN_MEMORY_RATIO and build >= MIN_BUILD_RATIO
+        print(
+            f"{BUDGET_COURSES} courses: {memory:.1f}x less memory "
+            f"(target {MIN_MEMORY_RATIO:.0f}x), {build:.1f}x faster build "
+            f"(target {MIN_BUILD_RATIO}x): {'OK' if ok else 'OVER BUDGET'}"
+        )
+
+
+if __name__ == "__main__":
+    main()
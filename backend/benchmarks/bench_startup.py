@@ -0,0 +1,68 @@
+# backend/benchmarks/bench_startup.py
+"""
+Worker startup time: what a fresh uvicorn worker pays before serving.
+
+    python -m backend.benchmarks.bench_startup --runs 10
+
+Each run is a fresh interpreter that imports backend.app.main and builds the
+app with create_app(), the same work a uvicorn worker does at boot (the
+lifespan hook only touches the database with DB_CREATE_ALL). The
+framework floor (fastapi + sqlalchemy.orm + pydantic_settings alone) is
+measured the same way, so the app's own share is visible.
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+# Per-worker budget for import + create_app, framework floor included
+BUDGET_S = 1.5
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "../.."))
+
+APP = """
+import time
+started = time.perf_counter()
+from backend.app.main import create_app
+create_app()
+print(time.perf_counter() - started)
+"""
+
+FLOOR = """
+import time
+started = time.perf_counter()
+import fastapi, sqlalchemy.orm, pydantic_settings
+print(time.perf_counter() - started)
+"""
+
+
+def _median_s(code: str, runs: int) -> float:
+    times = []
+    for _ in range(runs):
+        out = subprocess.run(
+            [sys.executable, "-c", code],
+            cwd=ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        times.append(float(out.stdout.splitlines()[-1]))
+    return statistics.median(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=10)
+    args = parser.parse_args()
+
+    floor = _median_s(FLOOR, args.runs)
+    app = _median_s(APP, args.runs)
+    print(f"framework floor      {floor * 1000:7.0f} ms")
+    print(f"import + create_app  {app * 1000:7.0f} ms  (app share {(app - floor) * 1000:.0f} ms)")
+    verdict = "OK" if app < BUDGET_S else "OVER BUDGET"
+    print(f"budget {BUDGET_S * 1000:.0f} ms per worker: {verdict}")
+
+
+if __name__ == "__main__":
+    main()
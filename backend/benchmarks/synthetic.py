@@ -0,0 +1,79 @@
+# backend/benchmarks/synthetic.py
+"""Synthetic catalogs for benchmarks. Deterministic for a given seed."""
+import csv
+import random
+
+HEADER = ["program", "course_code", "course_name", "credits", "description", "prerequisites"]
+
+
+def subject(p: int) -> str:
+    """Letters-only subject prefix for program p: SA, SB, ..., SZ, SBA, ..."""
+    letters = ""
+    while True:
+        p, r = divmod(p, 26)
+        letters = chr(ord("A") + r) + letters
+        if not p:
+            return "S" + letters
+
+
+def course_code(p: int, i: int) -> str:
+    return f"{subject(p)}{i:04d}"
+
+
+def catalog_rows(programs: int, courses_per_program: int, seed: int = 0):
+    """
+    Yield CSV rows for `programs` programs of `courses_per_program` courses.
+    Each course after the first few gets an AND/OR prerequisite expression
+    over earlier courses of the same program, like a real curriculum DAG.
+    """
+    rng = random.Random(seed)
+    for p in range(programs):
+        program = f"Synthetic Program {p:04d}"
+        for i in range(courses_per_program):
+            code = course_code(p, i)
+            prereqs = ""
+            if i >= 3:
+                earlier = [course_code(p, j) for j in rng.sample(range(i), 3)]
+                if rng.random() < 0.3:
+                    prereqs = f"{earlier[0]} OR {earlier[1]} AND {earlier[2]}"
+                else:
+                    prereqs = f"{earlier[0]} AND {earlier[1]}"
+            yield [program, code, f"Course {code}", rng.choice([3, 4]), "", prereqs]
+
+
+def write_catalog(path: str, programs: int, courses_per_program: int, seed: int = 0):
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(HEADER)
+        writer.writerows(catalog_rows(programs, courses_per_program, seed))
+
+
+def graph_rows(courses: int, seed: int = 0):
+    """
+    (courses, groups, edges) rows of one synthetic program, shaped like the
+    query results program_graph.build_graph turns into a ProgramGraph.
+    """
+    from backend.app.services.prereq_parser import parse_prerequisites
+
+    course_rows, groups, edges = [], [], []
+    group_id = 0
+    for course_id, row in enumerate(catalog_rows(1, courses, seed), start=1):
+        _, code, name, credits, _, prereqs = row
+        course_rows.append((course_id, code, name, credits))
+        for group in parse_prerequisites(prereqs):
+            group_id += 1
+            node = f"group-{group_id}"
+            groups.append((node, group["type"]))
+            edges.append((node, code))
+            edges.extend((member, node) for member in group["courses"])
+    return course_rows, groups, edges
+
+
+def program_graph(courses: int, seed: int = 0):
+    """
+    The graph program_graph.build_graph would produce for one synthetic
+    program of `courses` courses, built in memory without a database.
+    """
+    from backend.app.services.program_graph import ProgramGraph
+
+    return ProgramGraph.from_rows(*graph_rows(courses, seed))
@@ -0,0 +1,27 @@
+"""add program graph_version
+
+Revision ID: 3c1d9a7e5b42
+Revises: 8f880d17d2af
+Create Date: 2026-10-18 09:12:04.381220
+"""
+
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "3c1d9a7e5b42"
+down_revision: Union[str, Sequence[str], None] = "8f880d17d2af"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade():
+    op.add_column(
+        "programs",
+        sa.Column("graph_version", sa.Integer, nullable=False, server_default="0"),
+    )
+
+
+def downgrade():
+    op.drop_column("programs", "graph_version")
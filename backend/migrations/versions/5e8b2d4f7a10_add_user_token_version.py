@@ -0,0 +1,27 @@
+"""add users.token_version
+
+Revision ID: 5e8b2d4f7a10
+Revises: a7e2f0c41d93
+Create Date: 2026-10-18 14:02:51.318406
+"""
+
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "5e8b2d4f7a10"
+down_revision: Union[str, Sequence[str], None] = "a7e2f0c41d93"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade():
+    op.add_column(
+        "users",
+        sa.Column("token_version", sa.Integer, nullable=False, server_default="0"),
+    )
+
+
+def downgrade():
+    op.drop_column("users", "token_version")
@@ -0,0 +1,30 @@
+"""add import_checkpoints
+
+Revision ID: a7e2f0c41d93
+Revises: 3c1d9a7e5b42
+Create Date: 2026-10-18 11:40:27.905114
+"""
+
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "a7e2f0c41d93"
+down_revision: Union[str, Sequence[str], None] = "3c1d9a7e5b42"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade():
+    op.create_table(
+        "import_checkpoints",
+        sa.Column("import_key", sa.String(512), primary_key=True),
+        sa.Column("phase", sa.String(20), nullable=False),
+        sa.Column("rows_done", sa.Integer, nullable=False, server_default="0"),
+        sa.Column("updated_at", sa.DateTime, server_default=sa.func.now()),
+    )
+
+
+def downgrade():
+    op.drop_table("import_checkpoints")
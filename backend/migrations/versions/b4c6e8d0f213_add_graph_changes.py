@@ -0,0 +1,43 @@
+"""add graph_changes
+
+Revision ID: b4c6e8d0f213
+Revises: 5e8b2d4f7a10
+Create Date: 2026-10-18 16:25:09.541702
+"""
+
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "b4c6e8d0f213"
+down_revision: Union[str, Sequence[str], None] = "5e8b2d4f7a10"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade():
+    op.create_table(
+        "graph_changes",
+        sa.Column("change_id", sa.Integer, primary_key=True),
+        sa.Column(
+            "program_id",
+            sa.Integer,
+            sa.ForeignKey("programs.program_id", ondelete="CASCADE"),
+            nullable=False,
+        ),
+        sa.Column("version", sa.Integer, nullable=False),
+        sa.Column("op", sa.String(10), nullable=False),
+        sa.Column("course_id", sa.Integer),
+        sa.Column("group_id", sa.Integer),
+        sa.Column("prereq_course_id", sa.Integer),
+        sa.Column("created_at", sa.DateTime, server_default=sa.func.now()),
+    )
+    op.create_index(
+        "ix_graph_changes_program_version", "graph_changes", ["program_id", "version"]
+    )
+
+
+def downgrade():
+    op.drop_index("ix_graph_changes_program_version", table_name="graph_changes")
+    op.drop_table("graph_changes")
@@ -1,4 +1,6 @@
 import sys, os
+import uuid
+
 import pytest
 from fastapi.testclient import TestClient
 
@@ -6,6 +8,12 @@ from fastapi.testclient import TestClient
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
 
 from backend.app.main import app
+from backend.app.db import models
+from backend.app.db.database import SessionLocal, get_engine
+from backend.app.services.program_graph import graph_cache, latest_versions
+
+# The app no longer creates tables at import; the test database gets them here
+models.Base.metadata.create_all(bind=get_engine())
 
 
 @pytest.fixture()
@@ -13,3 +21,152 @@ def client():
     """FastAPI test client that uses the real app + real DB settings."""
     with TestClient(app) as c:
         yield c
+
+
+@pytest.fixture()
+def db():
+    """A session on the real DB, closed after the test."""
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+@pytest.fixture()
+def created_programs(db):
+    """Program ids registered here are deleted (with everything below them) after the test."""
+    created = []
+    yield created
+    db.rollback()
+    for program_id in created:
+        delete_program(db, program_id)
+    db.commit()
+    # SQLite may hand the same program_id to the next test's program
+    graph_cache.clear()
+    latest_versions.clear()
+
+
+@pytest.fixture()
+def make_program(db, created_programs):
+    """
+    Factory that creates a throwaway program with a chain of courses
+    (C0 -> C1 -> ... -> Cn-1) and deletes everything it created afterwards.
+    """
+
+    def _make(n_courses: int, name: str | None = None) -> models.Program:
+        program = models.Program(name=name or f"Test Program {uuid.uuid4().hex[:8]}")
+        db.add(program)
+        db.flush()
+        created_programs.append(program.program_id)
+
+        courses = [
+            models.Course(
+                program_id=program.program_id,
+                course_code=f"C{i}",
+                course_name=f"Course {i}",
+                credits=3,
+            )
+            for i in range(n_courses)
+        ]
+        db.add_all(courses)
+        db.flush()
+
+        db.add_all(
+            models.Prerequisite(
+                course_id=courses[i].course_id,
+                prereq_course_id=courses[i - 1].course_id,
+            )
+            for i in range(1, n_courses)
+        )
+        db.commit()
+        return program
+
+    return _make
+
+
+@pytest.fixture()
+def login(client, db):
+    """Factory that registers a throwaway user and returns (user_id, auth headers)."""
+    emails = []
+
+    def _login(role: str):
+        email = f"{role}-{uuid.uuid4().hex[:8]}@example.com"
+        emails.append(email)
+        creds = {"email": email, "password": "P@ssw0rd!"}
+        user_id = client.post("/auth/register", json={**creds, "role": role}).json()[
+            "user_id"
+        ]
+        access = client.post("/auth/login", json=creds).json()["access_token"]
+        return user_id, {"Authorization": f"Bearer {access}"}
+
+    yield _login
+    db.rollback()
+    user_ids = [
+        u for (u,) in db.query(models.User.user_id).filter(models.User.email.in_(emails))
+    ]
+    db.query(models.StudentProgress).filter(
+        models.StudentProgress.user_id.in_(user_ids)
+    ).delete(synchronize_session=False)
+    db.query(models.User).filter(models.User.user_id.in_(user_ids)).delete(
+        synchronize_session=False
+    )
+    db.commit()
+
+
+@pytest.fixture()
+def record_progress(client, login):
+    """Factory that syncs a student's progress items through an advisor."""
+    advisor = []
+
+    def _record(user_id: int, items: list[dict]):
+        if not advisor:
+            advisor.append(login("advisor")[1])
+        r = client.put(
+            f"/progress/users/{user_id}", json={"items": items}, headers=advisor[0]
+        )
+        assert r.status_code == 200
+        return r
+
+    return _record
+
+
+def delete_program(db, program_id: int) -> None:
+    # SQLite does not enforce ON DELETE CASCADE by default, so clean up bottom-up
+    course_ids = select_course_ids(db, program_id)
+    group_ids = [
+        g
+        for (g,) in db.query(models.PrerequisiteGroup.group_id).filter(
+            models.PrerequisiteGroup.course_id.in_(course_ids)
+        )
+    ]
+    db.query(models.PrerequisiteGroupMember).filter(
+        models.PrerequisiteGroupMember.group_id.in_(group_ids)
+    ).delete(synchronize_session=False)
+    db.query(models.PrerequisiteGroup).filter(
+        models.PrerequisiteGroup.group_id.in_(group_ids)
+    ).delete(synchronize_session=False)
+    db.query(models.StudentProgress).filter(
+        models.StudentProgress.course_id.in_(course_ids)
+    ).delete(synchronize_session=False)
+    db.query(models.Prerequisite).filter(
+        models.Prerequisite.course_id.in_(course_ids)
+    ).delete(synchronize_session=False)
+    db.query(models.Course).filter(models.Course.program_id == program_id).delete(
+        synchronize_session=False
+    )
+    db.query(models.GraphChange).filter(
+        models.GraphChange.program_id == program_id
+    ).delete(synchronize_session=False)
+    db.query(models.Program).filter(models.Program.program_id == program_id).delete(
+        synchronize_session=False
+    )
+
+
+def select_course_ids(db, program_id: int) -> list[int]:
+    return [
+        c
+        for (c,) in db.query(models.Course.course_id).filter(
+            models.Course.program_id == program_id
+        )
+    ]
@@ -0,0 +1,69 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy.engine import make_url
+
+from backend.app.core.config import settings
+from backend.app.db import database, models
+from backend.app.api import async_routes
+from backend.app.main import create_app
+
+pytest.importorskip(
+    database.ASYNC_DRIVERS[make_url(settings.DATABASE_URL).get_backend_name()]
+)
+
+
+@pytest.fixture
+def async_client(db):
+    app = FastAPI()
+    app.include_router(async_routes.router)
+    with TestClient(app) as c:
+        yield c
+        # The async pool is bound to this client's event loop
+        c.portal.call(database.dispose_async_engine)
+    db.query(models.User).filter(models.User.email == "async@example.com").delete()
+    db.commit()
+
+
+def test_async_database_url():
+    assert (
+        database.async_database_url("postgresql+psycopg2://u:p@localhost:5432/db")
+        == "postgresql+asyncpg://u:p@localhost:5432/db"
+    )
+    assert database.async_database_url("sqlite:////tmp/x.db") == "sqlite+aiosqlite:////tmp/x.db"
+
+
+def test_async_auth_flow(async_client):
+    user = {"email": "async@example.com", "password": "P@ssw0rd!"}
+    r = async_client.post("/auth/register", json={**user, "role": "student"})
+    assert r.status_code == 201
+
+    r = async_client.post("/auth/login", json=user)
+    assert r.status_code == 200
+    access = r.json()["access_token"]
+
+    r = async_client.get("/auth/me", headers={"Authorization": f"Bearer {access}"})
+    assert r.status_code == 200
+    assert r.json()["email"] == user["email"]
+
+
+def test_async_graph_route(async_client, make_program):
+    program_id = make_program(3).program_id
+
+    r = async_client.get(f"/graph/{program_id}")
+    assert r.status_code == 200
+    assert [n["data"]["id"] for n in r.json()["nodes"]] == ["C0", "C1", "C2"]
+
+    r = async_client.get(
+        f"/graph/{program_id}", headers={"If-None-Match": r.headers["etag"]}
+    )
+    assert r.status_code == 304
+
+    assert async_client.get("/graph/999999").status_code == 404
+
+
+def test_async_app_serves_graph_cache_stats(monkeypatch):
+    monkeypatch.setattr(settings, "DB_ASYNC", True)
+    r = TestClient(create_app()).get("/graph/cache/stats")
+    assert r.status_code == 200
+    assert "hits" in r.json()
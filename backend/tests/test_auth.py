@@ -1,10 +1,18 @@
+import time
+from datetime import timedelta
+
 import pytest
+from fastapi import Depends, FastAPI, HTTPException
 from fastapi.testclient import TestClient
+from sqlalchemy import event
 from sqlalchemy.orm import Session
 
 from app.main import app
-from backend.app.db.database import get_db
+from backend.app.api import auth
+from backend.app.core.deps import require_role
+from backend.app.db.database import get_db, get_engine
 from backend.app.db import models
+from backend.app.db.schemas import UserRole
 
 client = TestClient(app)
 
@@ -91,3 +99,107 @@ def test_role_based_access():
     data = r.json()
     assert data["email"] == "admin@example.com"
     assert data["role"] == "admin"
+
+
+def test_logout_revokes_tokens(user_payload):
+    client.post("/auth/register", json={**user_payload, "role": "student"})
+    tokens = client.post("/auth/login", json=user_payload).json()
+    headers = {"Authorization": f"Bearer {tokens['access_token']}"}
+    assert client.get("/auth/me", headers=headers).status_code == 200
+
+    assert client.post("/auth/logout", headers=headers).status_code == 200
+    assert client.get("/auth/me", headers=headers).status_code == 401
+    r = client.post("/auth/refresh", json={"refresh_token": tokens["refresh_token"]})
+    assert r.status_code == 401
+
+    # A fresh login is issued at the new token version
+    access = client.post("/auth/login", json=user_payload).json()["access_token"]
+    r = client.get("/auth/me", headers={"Authorization": f"Bearer {access}"})
+    assert r.status_code == 200
+
+
+def test_refresh_token_is_not_an_access_token(user_payload):
+    client.post("/auth/register", json={**user_payload, "role": "student"})
+    tokens = client.post("/auth/login", json=user_payload).json()
+    r = client.get(
+        "/auth/me", headers={"Authorization": f"Bearer {tokens['refresh_token']}"}
+    )
+    assert r.status_code == 401
+    r = client.post("/auth/refresh", json={"refresh_token": tokens["access_token"]})
+    assert r.status_code == 401
+
+
+def test_require_role(user_payload):
+    guarded = FastAPI()
+
+    @guarded.get("/staff")
+    def staff(user=Depends(require_role(UserRole.admin, UserRole.advisor))):
+        return {"role": user.role}
+
+    staff_client = TestClient(guarded)
+    client.post("/auth/register", json={**user_payload, "role": "student"})
+    access = client.post("/auth/login", json=user_payload).json()["access_token"]
+    headers = {"Authorization": f"Bearer {access}"}
+    assert staff_client.get("/staff", headers=headers).status_code == 403
+    assert staff_client.get("/staff").status_code == 401
+
+    client.post(
+        "/auth/register",
+        json={"email": "advisor@example.com", "password": "Secret123!", "role": "advisor"},
+    )
+    access = client.post(
+        "/auth/login", json={"email": "advisor@example.com", "password": "Secret123!"}
+    ).json()["access_token"]
+    r = staff_client.get("/staff", headers={"Authorization": f"Bearer {access}"})
+    assert r.status_code == 200
+    assert r.json() == {"role": "advisor"}
+
+
+def test_protected_routes_use_user_cache(user_payload):
+    engine = get_engine()
+    client.post("/auth/register", json={**user_payload, "role": "student"})
+    access = client.post("/auth/login", json=user_payload).json()["access_token"]
+    headers = {"Authorization": f"Bearer {access}"}
+    assert client.get("/auth/me", headers=headers).status_code == 200
+
+    statements = []
+    listener = lambda *args: statements.append(args[2])
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        r = client.get("/auth/me", headers=headers)
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+    assert r.status_code == 200
+    assert statements == []
+
+    # Role change through the ORM invalidates the cached user
+    db: Session = next(get_db())
+    user = db.query(models.User).filter_by(email=user_payload["email"]).one()
+    user.role = "advisor"
+    db.commit()
+    assert client.get("/auth/me", headers=headers).json()["role"] == "advisor"
+
+
+def test_decode_token_is_cached_until_exp(monkeypatch):
+    calls = []
+    real_decode = auth.jwt.decode
+    monkeypatch.setattr(
+        auth.jwt, "decode", lambda *a, **kw: calls.append(1) or real_decode(*a, **kw)
+    )
+
+    token = auth.create_access_token({"sub": "42"}, timedelta(seconds=1))
+    claims = auth.decode_token(token)
+    assert claims["sub"] == "42"
+    assert auth.decode_token(token)["sub"] == "42"
+    assert len(calls) == 1
+
+    # Past exp the cached claims are dropped and the token is verified again;
+    # jose compares exp in whole seconds, so wait out the second after it
+    time.sleep(claims["exp"] + 1 - time.time())
+    with pytest.raises(HTTPException) as exc:
+        auth.decode_token(token)
+    assert exc.value.status_code == 401
+    assert len(calls) == 2
+
+    with pytest.raises(HTTPException):
+        auth.decode_token(token[:-4] + "AAAA")
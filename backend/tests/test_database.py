@@ -0,0 +1,125 @@
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, exc, text
+from sqlalchemy.pool import QueuePool
+
+from backend.app.core import read_your_writes
+from backend.app.core.config import settings
+from backend.app.db import database, models
+from backend.app.main import create_app
+
+
+def test_engine_options_follow_settings(monkeypatch):
+    monkeypatch.setattr(settings, "DB_POOL_SIZE", 20)
+    monkeypatch.setattr(settings, "DB_MAX_OVERFLOW", 0)
+    monkeypatch.setattr(settings, "DB_STATEMENT_TIMEOUT_MS", 5000)
+
+    options = database.engine_options("postgresql+psycopg2://u:p@db/app")
+    assert options["poolclass"] is database.MeteredQueuePool
+    assert options["pool_size"] == 20 and options["max_overflow"] == 0
+    assert options["pool_pre_ping"] is False
+    assert options["connect_args"] == {"options": "-c statement_timeout=5000"}
+
+    options = database.engine_options("postgresql+asyncpg://u:p@db/app", is_async=True)
+    assert options["poolclass"] is database.MeteredAsyncQueuePool
+    assert options["connect_args"] == {
+        "server_settings": {"statement_timeout": "5000"}
+    }
+
+    # No statement timeout on SQLite; in-memory databases keep their own pool
+    assert "connect_args" not in database.engine_options("sqlite:////tmp/app.db")
+    assert database.engine_options("sqlite://") == {"pool_pre_ping": False}
+
+
+def test_metered_pool_counts_waits_and_timeouts(tmp_path):
+    metrics = database.PoolMetrics()
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'pool.db'}",
+        poolclass=database._metered(QueuePool, metrics),
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=0.05,
+    )
+    with engine.connect():
+        with pytest.raises(exc.TimeoutError):
+            engine.connect()
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+
+    stats = metrics.stats(engine.pool)
+    assert stats["checkouts"] == 2
+    assert stats["waits"] == 1 and stats["timeouts"] == 1
+    assert stats["checkout_ms_max"] >= 50
+    assert stats["size"] == 1 and stats["checked_out"] == 0
+    engine.dispose()
+
+
+def test_read_session_refuses_writes():
+    db = database.read_session()
+    try:
+        assert db.scalar(text("SELECT 1")) == 1
+        db.add(models.Program(name="never written"))
+        with pytest.raises(exc.InvalidRequestError):
+            db.commit()
+    finally:
+        db.close()
+
+
+def test_metrics_report_the_pool(client, make_program):
+    program = make_program(2)
+    assert client.get(f"/graph/{program.program_id}").status_code == 200
+
+    pool = client.get("/metrics").json()["db_pool"]
+    assert pool["sync"]["checkouts"] >= 1
+    assert pool["sync"]["timeouts"] == 0
+
+
+# === Read replicas ===
+@pytest.fixture()
+def replica(tmp_path, monkeypatch):
+    """A second, empty SQLite database standing in for a lagging replica."""
+    url = f"sqlite:///{tmp_path / 'replica.db'}"
+    engine = create_engine(url)
+    models.Base.metadata.create_all(bind=engine)
+    engine.dispose()
+    monkeypatch.setattr(settings, "DATABASE_REPLICA_URLS", url)
+    monkeypatch.setattr(database, "_replicas", None)
+    yield url
+    for r in database.get_replicas():
+        r.engine.dispose()
+
+
+def test_get_routes_read_from_the_replica(client, make_program, replica):
+    program = make_program(2)
+    # The program only exists on the primary
+    assert client.get(f"/graph/{program.program_id}").status_code == 404
+
+    pool = client.get("/metrics").json()["db_pool"]
+    assert pool["replicas"][0]["checkouts"] >= 1
+
+
+def test_read_your_writes_window_holds_across_workers(
+    client, make_program, login, replica
+):
+    program = make_program(1)
+    user_id, headers = login("student")
+    # A second app instance stands in for another worker process
+    other_worker = TestClient(create_app())
+    assert other_worker.get("/progress/me", headers=headers).json()["items"] == []
+
+    item = {"course_id": program.courses[0].course_id, "status": "in_progress"}
+    r = client.put("/progress/me", json={"items": [item]}, headers=headers)
+    assert r.status_code == 200
+    last_write = r.cookies[read_your_writes.COOKIE_NAME]
+
+    # Inside the window the write is visible from the other worker too
+    other_worker.cookies.set(read_your_writes.COOKIE_NAME, last_write)
+    assert len(other_worker.get("/progress/me", headers=headers).json()["items"]) == 1
+
+    # Without a valid window for this user, reads go back to the replica,
+    # which has not caught up
+    for cookie in (read_your_writes.sign_window(user_id + 1), last_write + "0", None):
+        other_worker.cookies.clear()
+        if cookie:
+            other_worker.cookies.set(read_your_writes.COOKIE_NAME, cookie)
+        assert other_worker.get("/progress/me", headers=headers).json()["items"] == []
@@ -0,0 +1,129 @@
+import json
+import random
+
+import numpy as np
+
+from backend.app.services.eligibility import compile_requirements, eligible_matrix
+from backend.app.services.program_graph import ProgramGraph
+from backend.tests.conftest import select_course_ids
+
+
+def _rows():
+    """
+    A, B, C have no prerequisites; D needs A (legacy edge);
+    E needs (A AND B) and (B OR C) as groups.
+    """
+    courses = [(100 + i, code, code, None) for i, code in enumerate("ABCDE")]
+    groups = [("group-1", "AND"), ("group-2", "OR")]
+    edges = [("A", "D")]
+    edges += [("A", "group-1"), ("B", "group-1"), ("group-1", "E")]
+    edges += [("B", "group-2"), ("C", "group-2"), ("group-2", "E")]
+    return courses, groups, edges
+
+
+def _eligible(reqs, done_codes):
+    done = reqs.mask(reqs.course_ids[reqs.codes.index(c)] for c in done_codes)
+    return [reqs.codes[i] for i in reqs.eligible(done)]
+
+
+def test_and_or_semantics():
+    reqs = compile_requirements(ProgramGraph.from_rows(*_rows()))
+    assert _eligible(reqs, "") == ["A", "B", "C"]
+    assert _eligible(reqs, "A") == ["B", "C", "D"]
+    # E's AND group needs B as well; its OR group is then satisfied by B
+    assert _eligible(reqs, "AB") == ["C", "D", "E"]
+    assert _eligible(reqs, "AC") == ["B", "D"]
+    assert _eligible(reqs, "ABCDE") == []
+
+
+def test_unknown_and_unresolved_courses_are_ignored():
+    courses, groups, edges = _rows()
+    groups.append(("group-3", "OR"))
+    # No members resolved in this program
+    edges += [("OTHER101", "group-3"), ("group-3", "C")]
+    reqs = compile_requirements(ProgramGraph.from_rows(courses, groups, edges))
+    assert reqs.mask([100, 999]) == 1
+    assert _eligible(reqs, "") == ["A", "B", "C"]
+
+
+def test_eligible_matrix_matches_bitset_engine():
+    rng = random.Random(0)
+    courses, groups, edges = _rows()
+    for i in range(5, 60):
+        earlier = [code for _, code, _, _ in courses]
+        courses.append((100 + i, f"X{i}", "", None))
+        edges.append((rng.choice(earlier), f"X{i}"))
+        groups.append((f"group-x{i}", rng.choice(["AND", "OR"])))
+        edges += [(c, f"group-x{i}") for c in rng.sample(earlier, 3)]
+        edges.append((f"group-x{i}", f"X{i}"))
+    reqs = compile_requirements(ProgramGraph.from_rows(courses, groups, edges))
+
+    done = np.array([[rng.random() < 0.4 for _ in reqs.codes] for _ in range(200)])
+    eligible = eligible_matrix(reqs, done)
+    for row, expected in zip(done, eligible):
+        mask = reqs.mask(c for c, d in zip(reqs.course_ids, row) if d)
+        assert np.flatnonzero(expected).tolist() == reqs.eligible(mask)
+
+
+def test_eligibility_endpoint(client, db, make_program, login, record_progress):
+    program = make_program(4)  # C0 -> C1 -> C2 -> C3
+    c0, c1, c2, c3 = select_course_ids(db, program.program_id)
+    student_id, headers = login("student")
+    url = f"/eligibility/{program.program_id}"
+
+    r = client.get(url, headers=headers)
+    assert r.status_code == 200
+    assert r.json()["eligible"] == [{"course_id": c0, "course_code": "C0"}]
+
+    items = [
+        {"course_id": c0, "status": "completed"},
+        {"course_id": c1, "status": "in_progress"},
+    ]
+    record_progress(student_id, items)
+    codes = lambda r: [c["course_code"] for c in r.json()["eligible"]]
+    assert codes(client.get(url, headers=headers)) == ["C1"]
+    r = client.get(url, params={"include_in_progress": True}, headers=headers)
+    assert codes(r) == ["C2"]
+
+    assert client.get("/eligibility/999999", headers=headers).status_code == 404
+
+
+def test_eligibility_for_other_students_is_staff_only(client, make_program, login):
+    program = make_program(2)
+    student_id, student = login("student")
+    _, advisor = login("advisor")
+    url = f"/eligibility/{program.program_id}/users/{student_id}"
+    assert client.get(url, headers=student).status_code == 403
+    r = client.get(url, headers=advisor)
+    assert r.status_code == 200
+    assert [c["course_code"] for c in r.json()["eligible"]] == ["C0"]
+
+
+def test_cohort_eligibility_streams_ndjson(
+    client, db, make_program, login, record_progress
+):
+    program = make_program(3)  # C0 -> C1 -> C2
+    c0, c1, c2 = select_course_ids(db, program.program_id)
+    first_id, first = login("student")
+    second_id, second = login("student")
+    _, advisor = login("advisor")
+    record_progress(first_id, [{"course_id": c0, "status": "completed"}])
+    client.put(
+        "/progress/me",
+        json={"items": [{"course_id": c0, "status": "in_progress"}]},
+        headers=second,
+    )
+
+    url = f"/eligibility/{program.program_id}/cohort"
+    assert client.get(url, headers=first).status_code == 403
+    r = client.get(url, headers=advisor)
+    assert r.status_code == 200
+    assert r.headers["content-type"] == "application/x-ndjson"
+    lines = [json.loads(line) for line in r.text.splitlines()]
+    assert lines == [
+        {"user_id": first_id, "eligible": [c1]},
+        {"user_id": second_id, "eligible": [c0]},
+    ]
+
+    r = client.get(url, params={"include_in_progress": True}, headers=advisor)
+    assert [json.loads(line)["eligible"] for line in r.text.splitlines()] == [[c1], [c1]]
@@ -1,5 +1,12 @@
+import json
+
+from sqlalchemy import event
 from fastapi.testclient import TestClient
 from backend.app.main import app
+from backend.app.api.graph import get_program_graph
+from backend.app.db import models
+from backend.app.services import program_graph
+from backend.app.services.program_graph import graph_cache
 
 client = TestClient(app)
 
@@ -14,3 +21,204 @@ def test_graph_endpoint_ok():
         assert "edges" in data
         assert isinstance(data["nodes"], list)
         assert isinstance(data["edges"], list)
+
+
+def _count_statements(db, fn):
+    """Run fn() and return how many SQL statements it emitted on db's engine."""
+    statements = []
+
+    def _before_cursor_execute(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    engine = db.get_bind()
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    try:
+        result = fn()
+    finally:
+        event.remove(engine, "before_cursor_execute", _before_cursor_execute)
+    return result, len(statements)
+
+
+def _graph(program_id, db):
+    return json.loads(get_program_graph(program_id, db, if_none_match=None).body)
+
+
+def test_graph_edges_resolve_to_course_codes(db, make_program):
+    program = make_program(3)
+    data = _graph(program.program_id, db)
+
+    assert [n["data"]["id"] for n in data["nodes"]] == ["C0", "C1", "C2"]
+    assert [(e["data"]["source"], e["data"]["target"]) for e in data["edges"]] == [
+        ("C0", "C1"),
+        ("C1", "C2"),
+    ]
+
+
+def test_graph_query_count_does_not_grow_with_edges(db, make_program):
+    small_id = make_program(3).program_id
+    large_id = make_program(40).program_id
+
+    small_data, small_count = _count_statements(
+        db, lambda: _graph(small_id, db)
+    )
+    large_data, large_count = _count_statements(
+        db, lambda: _graph(large_id, db)
+    )
+
+    assert len(small_data["edges"]) == 2
+    assert len(large_data["edges"]) == 39
+    assert large_count == small_count
+
+
+def test_graph_includes_prerequisite_groups(db, make_program):
+    program_id = make_program(4).program_id
+    c = {
+        code: course_id
+        for code, course_id in db.query(
+            models.Course.course_code, models.Course.course_id
+        ).filter(models.Course.program_id == program_id)
+    }
+
+    # C3 requires (C0 OR C1) AND C2
+    or_group = models.PrerequisiteGroup(course_id=c["C3"], type="OR")
+    and_group = models.PrerequisiteGroup(course_id=c["C3"], type="AND")
+    db.add_all([or_group, and_group])
+    db.flush()
+    db.add_all(
+        [
+            models.PrerequisiteGroupMember(
+                group_id=or_group.group_id, prereq_course_id=c["C0"]
+            ),
+            models.PrerequisiteGroupMember(
+                group_id=or_group.group_id, prereq_course_id=c["C1"]
+            ),
+            models.PrerequisiteGroupMember(
+                group_id=and_group.group_id, prereq_course_id=c["C2"]
+            ),
+        ]
+    )
+    db.commit()
+    or_node, and_node = f"group-{or_group.group_id}", f"group-{and_group.group_id}"
+
+    data = _graph(program_id, db)
+
+    groups = {
+        n["data"]["id"]: n["data"]["label"]
+        for n in data["nodes"]
+        if n["data"]["type"] == "group"
+    }
+    assert groups == {or_node: "OR", and_node: "AND"}
+    edges = {(e["data"]["source"], e["data"]["target"]) for e in data["edges"]}
+    assert {
+        ("C0", or_node),
+        ("C1", or_node),
+        (or_node, "C3"),
+        ("C2", and_node),
+        (and_node, "C3"),
+    } <= edges
+
+
+def test_graph_is_served_from_cache_until_prerequisites_change(db, make_program):
+    program_id = make_program(3).program_id
+    c = {
+        code: course_id
+        for code, course_id in db.query(
+            models.Course.course_code, models.Course.course_id
+        ).filter(models.Course.program_id == program_id)
+    }
+
+    first, first_count = _count_statements(db, lambda: _graph(program_id, db))
+    hits = graph_cache.hits
+    second, second_count = _count_statements(db, lambda: _graph(program_id, db))
+    assert second == first
+    assert graph_cache.hits == hits + 1
+    assert second_count == 1  # only the version lookup
+    assert first_count > second_count
+
+    # An ORM write to the program's prerequisites bumps its graph_version
+    db.add(models.Prerequisite(course_id=c["C2"], prereq_course_id=c["C0"]))
+    db.commit()
+
+    third = _graph(program_id, db)
+    edges = {(e["data"]["source"], e["data"]["target"]) for e in third["edges"]}
+    assert ("C0", "C2") in edges
+
+
+def test_graph_cache_stats_endpoint():
+    response = client.get("/graph/cache/stats")
+    assert response.status_code == 200
+    assert {"hits", "misses", "evictions", "size", "maxsize"} <= set(response.json())
+
+
+def test_graph_conditional_request_returns_304(db, make_program):
+    program_id = make_program(3).program_id
+
+    response = get_program_graph(program_id, db, if_none_match=None)
+    etag = response.headers["etag"]
+    assert response.status_code == 200
+
+    misses = graph_cache.misses
+    not_modified, count = _count_statements(
+        db, lambda: get_program_graph(program_id, db, if_none_match=etag)
+    )
+    assert not_modified.status_code == 304
+    assert not_modified.body == b""
+    assert not_modified.headers["etag"] == etag
+    assert count == 1  # version lookup only, no graph work
+    assert graph_cache.misses == misses
+
+    # Weak validators and lists of validators match too
+    weak = get_program_graph(program_id, db, if_none_match=f'"other", W/{etag}')
+    assert weak.status_code == 304
+
+    # Any write to the program's courses changes the ETag
+    course = db.query(models.Course).filter_by(program_id=program_id).first()
+    course.course_name = "Renamed"
+    db.commit()
+    changed = get_program_graph(program_id, db, if_none_match=etag)
+    assert changed.status_code == 200
+    assert changed.headers["etag"] != etag
+
+
+def test_payload_matches_cytoscape_dicts():
+    graph = program_graph.ProgramGraph.from_rows(
+        [(1, "A1", 'Intro "quoted" \\ Über', 3), (2, "B2", None, None)],
+        [("group-7", "OR")],
+        [("A1", "group-7"), ("OTHER9", "group-7"), ("group-7", "B2")],
+    )
+    compiled = program_graph._compile(1, 1, graph)
+    assert json.loads(compiled.payload) == program_graph.to_cytoscape(graph)
+    assert program_graph.to_cytoscape(graph)["nodes"][-1] == {
+        "data": {"id": "OTHER9", "label": "OTHER9", "type": "course"}
+    }
+
+    # Strings ending in '",' must not be split apart
+    graph = program_graph.ProgramGraph.from_rows(
+        [(1, "A1", 'x",', 3), (2, 'B2",', "y", 3)], [], [("A1", 'B2",')]
+    )
+    compiled = program_graph._compile(1, 1, graph)
+    assert json.loads(compiled.payload) == program_graph.to_cytoscape(graph)
+
+
+def test_program_graph_csr_matches_networkx():
+    from backend.benchmarks.synthetic import program_graph as synthetic_graph
+
+    graph = synthetic_graph(80)
+    G = graph.to_networkx()
+    assert set(graph.edges()) == set(G.edges)
+    for i, node in enumerate(graph.ids):
+        assert [graph.ids[j] for j in graph.successors(i)] == sorted(
+            G.successors(node), key=graph.position
+        )
+        assert [graph.ids[j] for j in graph.predecessors(i)] == sorted(
+            G.predecessors(node), key=graph.position
+        )
+
+    u, v = graph.position("SA0000"), graph.position("SA0079")
+    updated = graph.with_edges(added=[(u, v)], removed=[(u, graph.succ[0])])
+    assert updated.has_edge(u, v) and not graph.has_edge(u, v)
+    assert not updated.has_edge(u, graph.succ[0])
+    assert updated.n_edges == graph.n_edges
+
+    lone = program_graph.ProgramGraph.from_rows([(1, "A1", "A", 3)])
+    assert (len(lone), lone.n_edges, list(lone.predecessors(0))) == (1, 0, [])
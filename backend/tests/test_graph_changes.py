@@ -0,0 +1,198 @@
+import pytest
+
+from backend.app.db import models
+from backend.app.services import program_graph
+from backend.app.services.eligibility import compile_requirements
+from backend.app.services.reachability import (
+    PrerequisiteCycleError,
+    ReachabilityIndex,
+    get_reachability,
+    prerequisite_masks,
+)
+from backend.tests.conftest import select_course_ids
+
+
+def _warm(db, program_id):
+    """Compile the program with every derived structure and return it."""
+    get_reachability(db, program_id)
+    return program_graph.get_compiled_graph(db, program_id)
+
+
+def _assert_matches_rebuild(db, compiled):
+    graph = program_graph.build_graph(db, compiled.program_id)
+    assert set(compiled.graph.edges()) == set(graph.edges())
+    reqs = compile_requirements(graph)
+    assert compiled.requirements.required == reqs.required
+    assert compiled.requirements.any_of == reqs.any_of
+    rebuilt = ReachabilityIndex(prerequisite_masks(reqs))
+    assert compiled.reachability.ancestors == rebuilt.ancestors
+    assert compiled.reachability.descendants == rebuilt.descendants
+
+
+def _forbid_rebuilds(monkeypatch):
+    def _fail(db, program_id):
+        raise AssertionError("graph was rebuilt instead of patched")
+
+    monkeypatch.setattr(program_graph, "build_graph", _fail)
+
+
+def test_edge_writes_are_logged(db, make_program):
+    program = make_program(3)
+    c0, c1, c2 = select_course_ids(db, program.program_id)
+    db.add(models.Prerequisite(course_id=c2, prereq_course_id=c0))
+    db.commit()
+    db.add(
+        models.Course(
+            program_id=program.program_id, course_code="NEW1", course_name="New"
+        )
+    )
+    db.commit()
+
+    changes = (
+        db.query(models.GraphChange)
+        .filter_by(program_id=program.program_id)
+        .order_by(models.GraphChange.change_id)
+        .all()
+    )
+    version = program_graph.get_program_version(db, program.program_id)
+    assert [(c.version, c.op) for c in changes[-2:]] == [
+        (version - 1, "add"),
+        (version, "rebuild"),
+    ]
+    assert (changes[-2].course_id, changes[-2].prereq_course_id) == (c2, c0)
+
+
+def test_added_edge_is_applied_incrementally(db, make_program, monkeypatch):
+    program = make_program(5)
+    c0, c1, c2, c3, c4 = select_course_ids(db, program.program_id)
+    _warm(db, program.program_id)
+
+    db.add(models.Prerequisite(course_id=c4, prereq_course_id=c1))
+    group = models.PrerequisiteGroup(course_id=c2, type="OR")
+    db.add(group)
+    db.commit()
+    # The new group forces one rebuild; member edges after it are replayed
+    _warm(db, program.program_id)
+
+    with monkeypatch.context() as patch:
+        _forbid_rebuilds(patch)
+        db.add(
+            models.PrerequisiteGroupMember(group_id=group.group_id, prereq_course_id=c0)
+        )
+        db.commit()
+        db.add(models.Prerequisite(course_id=c3, prereq_course_id=c0))
+        db.commit()
+        compiled = _warm(db, program.program_id)
+
+    reqs, index = compiled.requirements, compiled.reachability
+    assert index.is_ancestor(reqs.index[c0], reqs.index[c3])
+    _assert_matches_rebuild(db, compiled)
+
+
+def test_removed_edge_is_applied_incrementally(db, make_program, monkeypatch):
+    program = make_program(3)  # C0 -> C1 -> C2
+    c0, c1, c2 = select_course_ids(db, program.program_id)
+    before = _warm(db, program.program_id)
+    assert before.reachability.is_ancestor(before.requirements.index[c0], 2)
+
+    with monkeypatch.context() as patch:
+        _forbid_rebuilds(patch)
+        db.delete(db.query(models.Prerequisite).filter_by(course_id=c1).one())
+        db.commit()
+        compiled = _warm(db, program.program_id)
+
+    reqs, index = compiled.requirements, compiled.reachability
+    assert not index.is_ancestor(reqs.index[c0], reqs.index[c2])
+    assert ("C0", "C1") not in set(compiled.graph.edges())
+    # The cached previous version is untouched
+    assert ("C0", "C1") in set(before.graph.edges())
+
+
+def test_replay_counts_one_cache_miss(db, make_program):
+    program = make_program(3)
+    c0, c1, c2 = select_course_ids(db, program.program_id)
+    program_graph.get_compiled_graph(db, program.program_id)
+    db.add(models.Prerequisite(course_id=c2, prereq_course_id=c0))
+    db.commit()
+
+    stats = program_graph.graph_cache.stats()
+    program_graph.get_compiled_graph(db, program.program_id)
+    after = program_graph.graph_cache.stats()
+    # Looking up the replay base is a peek, not a second hit or miss
+    assert (after["hits"] - stats["hits"], after["misses"] - stats["misses"]) == (0, 1)
+
+
+def test_unlogged_version_gap_rebuilds(db, make_program):
+    program = make_program(3)
+    _warm(db, program.program_id)
+    models.bump_graph_versions(db.connection(), program_ids=[program.program_id])
+    db.commit()
+    compiled = _warm(db, program.program_id)
+    assert compiled.version == program_graph.get_program_version(db, program.program_id)
+    _assert_matches_rebuild(db, compiled)
+
+
+def test_cycle_introducing_edges_are_rejected(db, make_program):
+    program = make_program(4)  # C0 -> C1 -> C2 -> C3
+    c0, c1, c2, c3 = select_course_ids(db, program.program_id)
+
+    db.add(models.Prerequisite(course_id=c0, prereq_course_id=c3))
+    with pytest.raises(PrerequisiteCycleError):
+        db.commit()
+    db.rollback()
+
+    db.add(models.Prerequisite(course_id=c1, prereq_course_id=c1))
+    with pytest.raises(PrerequisiteCycleError):
+        db.commit()
+    db.rollback()
+
+    # Group members count: C3 in an OR group of C1 closes C1 -> C2 -> C3 -> C1
+    group = models.PrerequisiteGroup(course_id=c1, type="OR")
+    db.add(group)
+    db.commit()
+    db.add(models.PrerequisiteGroupMember(group_id=group.group_id, prereq_course_id=c3))
+    with pytest.raises(PrerequisiteCycleError):
+        db.commit()
+    db.rollback()
+
+    # Each edge alone is fine; flushed together they close X -> Y -> X
+    x, y = (
+        models.Course(program_id=program.program_id, course_code=code, course_name=code)
+        for code in ("X", "Y")
+    )
+    db.add_all([x, y])
+    db.commit()
+    db.add_all(
+        [
+            models.Prerequisite(course_id=y.course_id, prereq_course_id=x.course_id),
+            models.Prerequisite(course_id=x.course_id, prereq_course_id=y.course_id),
+        ]
+    )
+    with pytest.raises(PrerequisiteCycleError):
+        db.commit()
+    db.rollback()
+
+
+def test_prerequisite_edit_endpoints(client, db, make_program, login):
+    program = make_program(3)  # C0 -> C1 -> C2
+    _, admin = login("admin")
+    _, student = login("student")
+    url = f"/graph/{program.program_id}/prerequisites"
+
+    edge = {"course_code": "C2", "prereq_code": "C0"}
+    assert client.post(url, json=edge, headers=student).status_code == 403
+    assert client.post(url, json=edge, headers=admin).status_code == 201
+
+    cycle = {"course_code": "C0", "prereq_code": "C2"}
+    r = client.post(url, json=cycle, headers=admin)
+    assert r.status_code == 409
+    assert "cycle" in r.json()["detail"]
+    missing = {"course_code": "C0", "prereq_code": "NOPE"}
+    assert client.post(url, json=missing, headers=admin).status_code == 404
+
+    assert client.delete(f"{url}/C1/C0", headers=admin).status_code == 204
+    assert client.delete(f"{url}/C1/C0", headers=admin).status_code == 404
+    r = client.get(f"/graph/{program.program_id}/ancestors/C2")
+    assert r.json()["courses"] == ["C0", "C1"]
+    r = client.get(f"/graph/{program.program_id}/ancestors/C1")
+    assert r.json()["courses"] == []
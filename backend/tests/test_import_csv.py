@@ -0,0 +1,218 @@
+import csv
+import uuid
+
+import pytest
+
+from backend.app.db import models
+from backend.app.services import import_csv
+
+HEADER = ["program", "course_code", "course_name", "credits", "description", "prerequisites"]
+
+
+@pytest.fixture
+def catalog(tmp_path, db, created_programs):
+    """Write a catalog CSV for a uniquely named program; returns (path, name)."""
+    name = f"Import Test {uuid.uuid4().hex[:8]}"
+
+    def _write(rows):
+        path = tmp_path / f"{uuid.uuid4().hex}.csv"
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(HEADER)
+            for code, prereqs in rows:
+                writer.writerow([name, code, f"{code} name", 4, "desc", prereqs])
+        return path
+
+    yield _write, name
+
+    program_id = db.query(models.Program.program_id).filter_by(name=name).scalar()
+    if program_id is not None:
+        created_programs.append(program_id)
+
+
+def _groups(db, name):
+    """{course_code: sorted [(type, sorted member codes)]} for a program."""
+    program = db.query(models.Program).filter_by(name=name).one()
+    result = {}
+    for course in program.courses:
+        result[course.course_code] = sorted(
+            (g.type, sorted(m.prereq_course.course_code for m in g.members))
+            for g in course.prereq_groups
+        )
+    return result
+
+
+def test_import_builds_courses_and_groups(db, catalog):
+    write, name = catalog
+    path = write(
+        [
+            ("CS101", ""),
+            ("CS102", "CS101"),
+            ("BIO252", ""),
+            ("BIO253", ""),
+            ("TCHEM212", ""),
+            ("BIO300", "BIO252 OR BIO253 AND TCHEM212"),
+        ]
+    )
+
+    report = import_csv.import_csv(path)
+
+    assert report.rows == 6
+    assert report.courses == 6
+    assert report.groups == 3
+    assert report.members == 4
+    assert report.rows_per_sec > 0
+    groups = _groups(db, name)
+    assert groups["CS102"] == [("AND", ["CS101"])]
+    assert groups["BIO300"] == [("AND", ["TCHEM212"]), ("OR", ["BIO252", "BIO253"])]
+
+
+def test_reimport_replaces_groups_and_bumps_version(db, catalog):
+    write, name = catalog
+    import_csv.import_csv(write([("CS101", ""), ("CS102", "CS101")]))
+    version = db.query(models.Program.graph_version).filter_by(name=name).scalar()
+
+    report = import_csv.import_csv(
+        write([("CS101", ""), ("CS102", "CS101"), ("CS201", "CS102 OR CS101")])
+    )
+
+    assert report.courses == 3
+    groups = _groups(db, name)
+    assert groups["CS102"] == [("AND", ["CS101"])]
+    assert groups["CS201"] == [("OR", ["CS101", "CS102"])]
+    db.expire_all()
+    assert db.query(models.Program.graph_version).filter_by(name=name).scalar() > version
+
+
+def test_forward_references_resolve_within_program(db, catalog, created_programs):
+    write, name = catalog
+
+    # Another program with a course sharing the prerequisite's code must not match
+    other = models.Program(name=f"Other {uuid.uuid4().hex[:8]}")
+    db.add(other)
+    db.flush()
+    created_programs.append(other.program_id)
+    db.add(models.Course(program_id=other.program_id, course_code="MATH200", course_name="x"))
+    db.commit()
+
+    report = import_csv.import_csv(
+        write(
+            [
+                ("CS301", "CS201 AND MATH200"),  # CS201 appears later in the file
+                ("CS201", ""),
+            ]
+        )
+    )
+
+    # The unresolved MATH200 group is left out rather than stored empty
+    assert _groups(db, name)["CS301"] == [("AND", ["CS201"])]
+    assert report.unresolved == [
+        import_csv.UnresolvedPrerequisite(name, "CS301", "MATH200")
+    ]
+    assert "MATH200" in str(report)
+
+
+def test_spaced_and_hyphenated_codes_resolve(db, catalog):
+    write, name = catalog
+    report = import_csv.import_csv(
+        write([("CS 101", ""), ("CS-102", "CS 101"), ("cs201", "CS102")])
+    )
+
+    assert (report.groups, report.members, report.unresolved) == (2, 2, [])
+    groups = _groups(db, name)
+    assert groups["CS-102"] == [("AND", ["CS 101"])]
+    assert groups["cs201"] == [("AND", ["CS-102"])]
+
+
+def test_streaming_import_from_file_object_in_batches(db, catalog):
+    write, name = catalog
+    path = write(
+        [
+            ("CS401", "CS301"),
+            ("CS301", "CS201"),
+            ("CS201", "CS101"),
+            ("CS101", ""),
+            ("CS501", "CS401 OR CS301"),
+        ]
+    )
+
+    with open(path, newline="", encoding="utf-8") as f:
+        report = import_csv.import_csv(f, chunk_size=2)
+
+    assert report.rows == 5
+    assert report.batches == 6  # 3 course batches + 3 prerequisite batches
+    assert report.unresolved == []
+    groups = _groups(db, name)
+    assert groups["CS401"] == [("AND", ["CS301"])]
+    assert groups["CS501"] == [("OR", ["CS301", "CS401"])]
+    assert db.query(models.ImportCheckpoint).count() == 0
+
+
+def test_streaming_import_resumes_after_last_committed_batch(db, catalog, monkeypatch):
+    write, name = catalog
+    path = write([(f"C{i}", f"C{i - 1}" if i else "") for i in range(6)])
+
+    real = import_csv._replace_groups
+    calls = {"n": 0}
+
+    def flaky(conn, rows, report):
+        calls["n"] += 1
+        if calls["n"] == 2:
+            raise RuntimeError("connection lost")
+        return real(conn, rows, report)
+
+    monkeypatch.setattr(import_csv, "_replace_groups", flaky)
+    with pytest.raises(RuntimeError):
+        import_csv.import_csv(path, chunk_size=2)
+
+    checkpoint = db.query(models.ImportCheckpoint).one()
+    assert (checkpoint.phase, checkpoint.rows_done) == ("prerequisites", 2)
+
+    monkeypatch.setattr(import_csv, "_replace_groups", real)
+    report = import_csv.import_csv(path, chunk_size=2, resume=True)
+
+    assert report.batches == 2  # only the remaining prerequisite batches
+    groups = _groups(db, name)
+    assert groups["C1"] == [("AND", ["C0"])]
+    assert groups["C5"] == [("AND", ["C4"])]
+    assert db.query(models.ImportCheckpoint).count() == 0
+
+
+def test_parallel_import_partitions_by_program(db, tmp_path, created_programs):
+    names = [f"Parallel {i} {uuid.uuid4().hex[:8]}" for i in range(3)]
+    path = tmp_path / "catalog.csv"
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(HEADER)
+        for i in range(4):
+            for name in names:  # interleave programs row by row
+                writer.writerow([name, f"X{i}", "x", 3, "", f"X{i - 1}" if i else ""])
+
+    try:
+        report = import_csv.import_csv_parallel(path, workers=2, chunk_size=2)
+    finally:
+        created_programs.extend(
+            program_id
+            for (program_id,) in db.query(models.Program.program_id).filter(
+                models.Program.name.in_(names)
+            )
+        )
+
+    assert report.rows == 12
+    assert report.programs == 3
+    assert report.members == 9
+    for name in names:
+        assert _groups(db, name)["X3"] == [("AND", ["X2"])]
+
+
+def test_unparseable_prerequisites_are_reported(db, catalog):
+    write, name = catalog
+    report = import_csv.import_csv(
+        write([("CS101", ""), ("CS490", "Permission of instructor")])
+    )
+
+    assert report.courses == 2
+    assert _groups(db, name)["CS490"] == []
+    assert report.unresolved == [
+        import_csv.UnresolvedPrerequisite(name, "CS490", "Permission of instructor")
+    ]
@@ -0,0 +1,82 @@
+from backend.app.services.eligibility import compile_requirements
+from backend.app.services.planner import plan_terms
+from backend.app.services.program_graph import ProgramGraph
+from backend.benchmarks.synthetic import program_graph
+from backend.tests.conftest import select_course_ids
+
+
+def _assert_valid(reqs, plan, done, max_credits):
+    for term in plan.terms:
+        assert sum(reqs.credits[i] for i in term) <= max_credits or len(term) == 1
+        for i in term:
+            required = reqs.required[i]
+            assert required & done == required
+            assert all(m & done for m in reqs.any_of[i])
+        for i in term:
+            done |= 1 << i
+    assert done == (1 << len(reqs)) - 1
+
+
+def test_plan_respects_prerequisites_and_credit_cap():
+    reqs = compile_requirements(program_graph(120))
+    plan = plan_terms(reqs, 0, max_credits=12)
+    _assert_valid(reqs, plan, 0, 12)
+    assert plan.unschedulable == []
+    assert plan.lower_bound <= len(plan.terms)
+
+
+def test_plan_starts_from_progress():
+    reqs = compile_requirements(program_graph(60))
+    done = reqs.mask(reqs.course_ids[:20])
+    plan = plan_terms(reqs, done, max_credits=15)
+    _assert_valid(reqs, plan, done, 15)
+    assert all(i >= 20 for term in plan.terms for i in term)
+
+
+def test_or_group_needs_one_member_and_chain_sets_lower_bound():
+    graph = ProgramGraph.from_rows(
+        [(i + 1, code, code, 3) for i, code in enumerate("ABCD")],
+        [("group-1", "OR")],
+        [("A", "B"), ("B", "group-1"), ("C", "group-1"), ("group-1", "D")],
+    )
+    reqs = compile_requirements(graph)
+
+    plan = plan_terms(reqs, 0, max_credits=9)
+    # D only waits for C, so the A -> B chain is the critical path
+    assert plan.lower_bound == 2
+    assert len(plan.terms) == 2
+    _assert_valid(reqs, plan, 0, 9)
+
+
+def test_cycles_are_reported_unschedulable():
+    graph = ProgramGraph.from_rows(
+        [(i + 1, code, code, 3) for i, code in enumerate("ABC")],
+        edges=[("A", "B"), ("B", "A")],
+    )
+    reqs = compile_requirements(graph)
+    plan = plan_terms(reqs, 0)
+    assert [reqs.codes[i] for term in plan.terms for i in term] == ["C"]
+    assert sorted(reqs.codes[i] for i in plan.unschedulable) == ["A", "B"]
+
+
+def test_plan_endpoint(client, db, make_program, login, record_progress):
+    program = make_program(4)  # C0 -> C1 -> C2 -> C3, 3 credits each
+    c0, c1, *_ = select_course_ids(db, program.program_id)
+    student_id, headers = login("student")
+    items = [
+        {"course_id": c0, "status": "completed"},
+        {"course_id": c1, "status": "in_progress"},
+    ]
+    record_progress(student_id, items)
+
+    r = client.get(f"/plans/{program.program_id}", headers=headers)
+    assert r.status_code == 200
+    data = r.json()
+    assert [[c["course_code"] for c in t["courses"]] for t in data["terms"]] == [
+        ["C2"],
+        ["C3"],
+    ]
+    assert data["terms"][0]["credits"] == 3
+    assert data["lower_bound_terms"] == 2
+    assert data["unschedulable"] == []
+    assert client.get("/plans/999999", headers=headers).status_code == 404
@@ -0,0 +1,73 @@
+import pytest
+
+from backend.app.services.prereq_parser import (
+    And,
+    Course,
+    Or,
+    PrerequisiteSyntaxError,
+    parse_expression,
+    parse_prerequisites,
+)
+
+
+def _groups(text):
+    return [(g["type"], g["courses"]) for g in parse_prerequisites(text)]
+
+
+def test_legacy_strings_keep_their_meaning():
+    assert _groups("") == []
+    assert _groups("CS101") == [("AND", ["CS101"])]
+    assert _groups("BIO252 OR BIO253 AND TCHEM212") == [
+        ("OR", ["BIO252", "BIO253"]),
+        ("AND", ["TCHEM212"]),
+    ]
+
+
+def test_parentheses_and_nesting():
+    assert parse_expression("(cs101 or cs102) and (math120 or (math121 and math122))") == And(
+        (
+            Or((Course("CS101"), Course("CS102"))),
+            Or((Course("MATH120"), And((Course("MATH121"), Course("MATH122"))))),
+        )
+    )
+    # OR over AND distributes into CNF groups
+    assert _groups("MATH120 OR (MATH121 AND MATH122)") == [
+        ("OR", ["MATH120", "MATH121"]),
+        ("OR", ["MATH120", "MATH122"]),
+    ]
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("CS 101, CS 102, or CS 103", [("OR", ["CS101", "CS102", "CS103"])]),
+        ("CS101, CS102 or CS103", [("OR", ["CS101", "CS102", "CS103"])]),
+        ("CS101, CS102, and CS103", [("AND", ["CS101"]), ("AND", ["CS102"]), ("AND", ["CS103"])]),
+        ("CS101; MATH-120", [("AND", ["CS101"]), ("AND", ["MATH120"])]),
+        ("ENG101 & (PHYS101 / PHYS111)", [("AND", ["ENG101"]), ("OR", ["PHYS101", "PHYS111"])]),
+        ("None", []),
+    ],
+)
+def test_lists_and_separators(text, expected):
+    assert _groups(text) == expected
+
+
+def test_redundant_clauses_are_simplified():
+    assert _groups("CS101 AND CS101") == [("AND", ["CS101"])]
+    assert _groups("CS101 AND (CS101 OR CS102)") == [("AND", ["CS101"])]
+
+
+@pytest.mark.parametrize("text", ["Permission of instructor", "CS101 AND", "(CS101", "CS101 OR OR CS102"])
+def test_invalid_strings_raise(text):
+    with pytest.raises(PrerequisiteSyntaxError):
+        parse_prerequisites(text)
+
+
+def test_results_are_memoized_by_normalized_string():
+    from backend.app.services.prereq_parser import _parse_normalized
+
+    _parse_normalized.cache_clear()
+    parse_prerequisites("cs201 and  cs202")
+    parse_prerequisites("CS201 AND CS202 ")
+    info = _parse_normalized.cache_info()
+    assert (info.hits, info.misses) == (1, 1)
@@ -0,0 +1,92 @@
+from sqlalchemy import event
+
+from backend.tests.conftest import select_course_ids
+
+
+def test_transcript_sync_is_one_statement(client, db, make_program, login):
+    program = make_program(60)
+    course_ids = select_course_ids(db, program.program_id)
+    student_id, _ = login("student")
+    _, advisor = login("advisor")
+    # Warm the user cache so only the sync itself touches the database
+    client.get("/auth/me", headers=advisor)
+
+    items = [{"course_id": c, "status": "completed"} for c in course_ids]
+    statements = []
+    listener = lambda conn, cursor, statement, *args: statements.append(statement)
+    engine = db.get_bind()
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        r = client.put(
+            f"/progress/users/{student_id}", json={"items": items}, headers=advisor
+        )
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+
+    assert r.status_code == 200
+    assert r.json() == {"user_id": student_id, "upserted": 60}
+    assert len(statements) == 1
+    assert statements[0].lstrip().upper().startswith("INSERT")
+
+
+def test_sync_updates_existing_rows(client, make_program, db, login, record_progress):
+    program = make_program(3)
+    c0, c1, c2 = select_course_ids(db, program.program_id)
+    student_id, headers = login("student")
+
+    first = [{"course_id": c0, "status": "completed"}, {"course_id": c1, "status": "in_progress"}]
+    record_progress(student_id, first)
+
+    # c1 moves on, c2 is new; a repeated course in one batch keeps the last status
+    second = [
+        {"course_id": c1, "status": "in_progress"},
+        {"course_id": c1, "status": "completed"},
+        {"course_id": c2, "status": "planned"},
+    ]
+    r = record_progress(student_id, second)
+    assert r.json()["upserted"] == 2
+
+    items = client.get("/progress/me", headers=headers).json()["items"]
+    assert [(i["course_id"], i["status"]) for i in items] == [
+        (c0, "completed"),
+        (c1, "completed"),
+        (c2, "planned"),
+    ]
+
+
+def test_progress_pagination(client, make_program, db, login):
+    program = make_program(5)
+    course_ids = select_course_ids(db, program.program_id)
+    _, headers = login("student")
+    items = [{"course_id": c, "status": "planned"} for c in course_ids]
+    client.put("/progress/me", json={"items": items}, headers=headers)
+
+    seen, after = [], None
+    while True:
+        params = {"limit": 2} | ({"after": after} if after is not None else {})
+        page = client.get("/progress/me", params=params, headers=headers).json()
+        seen += [i["course_id"] for i in page["items"]]
+        after = page["next_after"]
+        if after is None:
+            break
+    assert seen == sorted(course_ids)
+
+
+def test_progress_validation_and_roles(client, make_program, db, login):
+    program = make_program(1)
+    (c0,) = select_course_ids(db, program.program_id)
+    other_id, student = login("student")
+
+    bad = {"items": [{"course_id": c0, "status": "passed"}]}
+    assert client.put("/progress/me", json=bad, headers=student).status_code == 422
+
+    ok = {"items": [{"course_id": c0, "status": "completed"}]}
+    r = client.put(f"/progress/users/{other_id}", json=ok, headers=student)
+    assert r.status_code == 403
+
+    # Students plan their own courses but cannot mark them completed
+    assert client.put("/progress/me", json=ok, headers=student).status_code == 403
+    planned = {"items": [{"course_id": c0, "status": "planned"}]}
+    assert client.put("/progress/me", json=planned, headers=student).status_code == 200
+    assert client.get("/progress/me", headers=student).json()["items"][0]["status"] == "planned"
+    assert client.get("/progress/me").status_code == 401
@@ -0,0 +1,82 @@
+import random
+
+import networkx as nx
+
+from backend.app.services.eligibility import compile_requirements
+from backend.app.services.program_graph import ProgramGraph
+from backend.app.services.reachability import ReachabilityIndex, prerequisite_masks
+
+
+def _random_dag(n=60, seed=0):
+    rng = random.Random(seed)
+    courses = [(i + 1, f"C{i}", "", None) for i in range(n)]
+    groups, edges = [], []
+    for i in range(3, n):
+        groups.append((f"group-{i}", rng.choice(["AND", "OR"])))
+        edges += [(f"C{j}", f"group-{i}") for j in rng.sample(range(i), 2)]
+        edges.append((f"group-{i}", f"C{i}"))
+        if rng.random() < 0.5:
+            edges.append((f"C{rng.randrange(i)}", f"C{i}"))
+    return ProgramGraph.from_rows(courses, groups, edges)
+
+
+def _closure(graph):
+    """Course -> course pairs of the transitive closure, through group nodes."""
+    G = graph.to_networkx()
+    return nx.DiGraph(
+        (u, v)
+        for u in G
+        for v in nx.descendants(G, u)
+        if G.nodes[u]["type"] == G.nodes[v]["type"] == "course"
+    )
+
+
+def test_index_matches_networkx_closure():
+    graph = _random_dag()
+    reqs = compile_requirements(graph)
+    index = ReachabilityIndex(prerequisite_masks(reqs))
+    closure = _closure(graph)
+    for a, code_a in enumerate(reqs.codes):
+        for b, code_b in enumerate(reqs.codes):
+            expected = closure.has_edge(code_a, code_b)
+            assert index.is_ancestor(a, b) == expected
+            assert index.is_descendant(b, a) == expected
+
+
+def test_add_edge_updates_index_in_place():
+    graph = _random_dag(seed=1)
+    reqs = compile_requirements(graph)
+    index = ReachabilityIndex(prerequisite_masks(reqs))
+    # C40 becomes a prerequisite of C50; only earlier courses feed later ones
+    edge = (reqs.positions["C40"], reqs.positions["C50"])
+    index.add_edge(*edge)
+    graph = graph.with_edges(added=[edge])
+    rebuilt = ReachabilityIndex(prerequisite_masks(compile_requirements(graph)))
+    assert index.ancestors == rebuilt.ancestors
+    assert index.descendants == rebuilt.descendants
+
+
+def test_cycles_are_closed_by_fixpoint():
+    graph = ProgramGraph.from_rows(
+        [(i + 1, code, code, None) for i, code in enumerate("ABC")],
+        edges=[("A", "B"), ("B", "C"), ("C", "A")],
+    )
+    index = ReachabilityIndex(prerequisite_masks(compile_requirements(graph)))
+    assert all(index.ancestors[i] == 0b111 for i in range(3))
+
+
+def test_ancestor_and_descendant_endpoints(client, make_program):
+    program = make_program(4)  # C0 -> C1 -> C2 -> C3
+    url = f"/graph/{program.program_id}"
+
+    r = client.get(f"{url}/ancestors/C2")
+    assert r.status_code == 200
+    assert r.json() == {
+        "program_id": program.program_id,
+        "course_code": "C2",
+        "courses": ["C0", "C1"],
+    }
+    assert client.get(f"{url}/descendants/C1").json()["courses"] == ["C2", "C3"]
+    assert client.get(f"{url}/descendants/C3").json()["courses"] == []
+    assert client.get(f"{url}/ancestors/NOPE").status_code == 404
+    assert client.get("/graph/999999/ancestors/C0").status_code == 404
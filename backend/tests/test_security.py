@@ -0,0 +1,89 @@
+import time
+import uuid
+from concurrent.futures import Future, ThreadPoolExecutor
+
+import anyio
+import pytest
+from fastapi import HTTPException
+
+from backend.app.core.security import PasswordHasher, password_hasher
+from backend.app.db import models
+
+
+@pytest.fixture
+def hasher():
+    h = PasswordHasher(workers=1, max_pending=1, timeout=30)
+    yield h
+    h.shutdown()
+
+
+def test_hash_and_verify_run_in_worker_pool(hasher):
+    hashed = hasher.hash("P@ssw0rd!")
+    assert hasher.verify("P@ssw0rd!", hashed)
+    assert not hasher.verify("wrong", hashed)
+
+    stats = hasher.stats()
+    assert stats["completed"] == 3
+    assert stats["in_flight"] == 0
+
+
+def test_full_queue_is_rejected_with_503(hasher):
+    busy = hasher._submit(time.sleep, 1)
+    assert hasher.stats()["in_flight"] == 1
+
+    with pytest.raises(HTTPException) as exc:
+        hasher.hash("P@ssw0rd!")
+    assert exc.value.status_code == 503
+    assert hasher.stats()["rejected"] == 1
+
+    busy.result()
+    while hasher.stats()["in_flight"]:  # done-callbacks run just after result()
+        time.sleep(0.01)
+    assert hasher.verify("x", hasher.hash("x"))
+
+
+def test_inline_mode_without_workers():
+    h = PasswordHasher(workers=0, max_pending=1, timeout=1)
+    assert h.verify("x", h.hash("x"))
+    assert h.stats()["completed"] == 0
+
+
+def test_login_burst_does_not_starve_graph_routes(client, db, make_program, monkeypatch):
+    program = make_program(3)
+    creds = {"email": f"burst-{uuid.uuid4().hex[:8]}@example.com", "password": "P@ssw0rd!"}
+    assert client.post("/auth/register", json={**creds, "role": "student"}).status_code == 201
+
+    # Hold every bcrypt call until released, as a saturated worker pool would
+    pending = []
+
+    def submit(fn, *args):
+        pending.append((Future(), fn, args))
+        return pending[-1][0]
+
+    monkeypatch.setattr(password_hasher, "workers", 1)
+    monkeypatch.setattr(password_hasher, "_submit", submit)
+    # Shrink the threadpool so logins holding a thread each would fill it
+    limiter = client.portal.call(anyio.to_thread.current_default_thread_limiter)
+    client.portal.call(setattr, limiter, "total_tokens", 4)
+    try:
+        with ThreadPoolExecutor(12) as pool:
+            burst = [pool.submit(client.post, "/auth/login", json=creds) for _ in range(12)]
+            # More logins wait on bcrypt than there are threads: none holds one
+            deadline = time.monotonic() + 10
+            while len(pending) < 12:
+                assert time.monotonic() < deadline, f"{len(pending)} logins reached bcrypt"
+                time.sleep(0.005)
+            r = client.get(f"/graph/{program.program_id}")
+            assert r.status_code == 200
+            assert not any(future.done() for future, _, _ in pending)
+
+            for future, fn, args in pending:
+                future.set_result(fn(*args))
+            assert [f.result().status_code for f in burst] == [200] * 12
+    finally:
+        for future, fn, args in pending:
+            if not future.done():
+                future.set_result(fn(*args))
+        client.portal.call(setattr, limiter, "total_tokens", 40)
+        db.query(models.User).filter(models.User.email == creds["email"]).delete()
+        db.commit()
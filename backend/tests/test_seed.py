@@ -0,0 +1,17 @@
+from backend.app.db.database import get_engine
+from backend.app.services.seed import seed
+
+
+def test_reseed_changes_the_graph_etag(client, created_programs):
+    with get_engine().begin() as conn:
+        program_id = seed(conn)
+    created_programs.append(program_id)
+
+    first = client.get(f"/graph/{program_id}")
+    assert first.status_code == 200
+    with get_engine().begin() as conn:
+        assert seed(conn) == program_id
+
+    r = client.get(f"/graph/{program_id}", headers={"If-None-Match": first.headers["etag"]})
+    assert r.status_code == 200
+    assert r.headers["etag"] != first.headers["etag"]
@@ -0,0 +1,64 @@
+import json
+import os
+import subprocess
+import sys
+
+from fastapi.testclient import TestClient
+
+from backend.app.main import create_app
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "../.."))
+
+PROBE = """
+import json, sys
+from backend.app.main import create_app
+from backend.app.db import database
+create_app()
+print(json.dumps({
+    "engine": database._engine is not None,
+    "heavy": sorted(m for m in ("networkx", "numpy") if m in sys.modules),
+}))
+"""
+
+
+def test_import_and_create_app_stay_off_the_database():
+    out = subprocess.run(
+        [sys.executable, "-c", PROBE],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    assert json.loads(out.stdout.splitlines()[-1]) == {"engine": False, "heavy": []}
+
+
+def test_create_app_mounts_every_router():
+    paths = create_app().openapi()["paths"]
+    for path in [
+        "/metrics",
+        "/auth/login",
+        "/graph/{program_id}",
+        "/graph/{program_id}/ancestors/{course_code}",
+        "/graph/{program_id}/prerequisites",
+        "/progress/me",
+        "/eligibility/{program_id}",
+        "/plans/{program_id}",
+    ]:
+        assert path in paths
+
+
+def test_lifespan_runs_create_all_only_when_enabled(monkeypatch):
+    from backend.app import main
+
+    calls = []
+    monkeypatch.setattr(
+        main.models.Base.metadata, "create_all", lambda bind: calls.append(bind)
+    )
+    with TestClient(create_app()):
+        pass
+    assert calls == []
+
+    monkeypatch.setattr(main.settings, "DB_CREATE_ALL", True)
+    with TestClient(create_app()):
+        pass
+    assert len(calls) == 1